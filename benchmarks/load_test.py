@@ -0,0 +1,235 @@
+"""Load test for the `get_data` serving path, run locally outside Modal.
+
+    python benchmarks/load_test.py                          # 100 editions, 4 workers, 32 clients, 10s
+    python benchmarks/load_test.py --editions 2000 --clients 64 --reload-ms 40
+    python benchmarks/load_test.py --path legacy            # old json.load + re-serialize path, for comparison
+
+Writes a seeded fixture payload of the requested size, serves it with
+`serve_app.data_response` behind uvicorn (`--workers` processes, like Modal
+containers), drives it with concurrent keep-alive clients and reports RPS,
+latency percentiles and peak RSS per worker. `--reload-ms` adds a sleep per
+request to stand in for `vol.reload()`, which can't run outside Modal.
+Needs `fastapi[standard]` (uvicorn); results are appended to
+`benchmarks/results/load_history.jsonl`.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.replay import percentile, phrase
+
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "results", "load_history.jsonl")
+
+
+def write_fixture_payload(data_dir, editions=100, stories=12, reddit_posts=50, seed=7):
+    """Writes a master_payload.json shaped like the pipeline's. Returns its size in bytes."""
+    from glaido import records
+    rng = random.Random(seed)
+    words = lambda n: phrase(rng, n)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(editions):
+        source = ("Ben's Bites", "The Rundown AI")[i % 2]
+        items.append(records.Item(
+            type="edition", title=words(6).title(), source=source, url=f"https://example.com/p/edition-{i}",
+            summary=words(60).capitalize() + ".", published_at=(start + timedelta(hours=12 * i)).isoformat(),
+            thumbnail=f"https://cdn.example.com/lead/{i}.jpg", thumb=f"{i:020x}",
+            stories=[records.Story(title=words(8).title(), url=f"https://news.example.com/{i}/{j}",
+                                   summary=words(30).capitalize() + ".", thumbnail=f"https://cdn.example.com/og/{i}-{j}.jpg")
+                     for j in range(stories)]))
+    for i in range(reddit_posts):
+        items.append(records.Item(
+            type="article", title=words(10).capitalize() + "?", source="Reddit", url=f"https://www.reddit.com/r/ai/comments/{i}",
+            summary=words(50), published_at=(start + timedelta(hours=i)).isoformat()))
+    path = os.path.join(data_dir, "master_payload.json")
+    with open(path, "w") as f:
+        json.dump({"last_updated": datetime.now(timezone.utc).isoformat(), "articles": items}, f, indent=2, default=records.wire)
+    return os.path.getsize(path)
+
+
+def create_app():
+    """uvicorn factory: the get_data endpoint logic on a plain FastAPI app.
+    Configured through LOADTEST_DATA_DIR / LOADTEST_PATH / LOADTEST_RELOAD_MS."""
+    from fastapi import FastAPI
+    import serve_app
+    data_dir = os.environ["LOADTEST_DATA_DIR"]
+    legacy = os.environ.get("LOADTEST_PATH") == "legacy"
+    reload_s = int(os.environ.get("LOADTEST_RELOAD_MS", "0")) / 1000
+    api = FastAPI()
+
+    @api.get("/")
+    def get_data():
+        if reload_s: time.sleep(reload_s)  # stand-in for vol.reload()
+        if legacy:
+            # The pre-serve_app path: parse the payload, let FastAPI re-serialize it
+            try:
+                with open(os.path.join(data_dir, "master_payload.json")) as f: return json.load(f)
+            except OSError: return {"error": "No data found."}
+        return serve_app.data_response(data_dir)
+
+    return api
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def worker_pids(parent_pid):
+    """Child processes of the uvicorn supervisor (Linux /proc only)."""
+    pids = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit(): continue
+        try:
+            with open(f"/proc/{entry}/stat") as f: ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError): continue
+        if ppid != parent_pid: continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f: cmdline = f.read()
+        except OSError: continue
+        if b"resource_tracker" not in cmdline: pids.append(int(entry))  # multiprocessing helper, not a worker
+    return pids
+
+
+def memory_kb(pid):
+    """(current, peak) RSS of a process in KB, from /proc/<pid>/status."""
+    mem = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":")
+                    mem[key] = int(value.split()[0])
+    except OSError: pass
+    return mem.get("VmRSS"), mem.get("VmHWM")
+
+
+def drive(port, clients, duration):
+    """Runs `clients` keep-alive clients for `duration` seconds. Returns (latencies, errors, bytes)."""
+    latencies, errors, received = [], [0], [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine, nbytes, failed = [], 0, 0
+        while time.perf_counter() < stop_at:
+            t = time.perf_counter()
+            try:
+                conn.request("GET", "/")
+                response = conn.getresponse()
+                body = response.read()
+                if response.status != 200: failed += 1
+                nbytes += len(body)
+                mine.append(time.perf_counter() - t)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+            received[0] += nbytes
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return sorted(latencies), errors[0], received[0]
+
+
+def run(args, data_dir):
+    port = free_port()
+    env = dict(os.environ, LOADTEST_DATA_DIR=data_dir, LOADTEST_PATH=args.path, LOADTEST_RELOAD_MS=str(args.reload_ms),
+               PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.load_test:create_app", "--factory",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT, env=env)
+    try:
+        if not wait_until_up(port):
+            raise SystemExit("❌ Server did not come up (is fastapi[standard] installed?)")
+        pids = worker_pids(server.pid) or [server.pid]
+        idle = {pid: memory_kb(pid)[0] for pid in pids}
+        if args.warmup: drive(port, args.clients, args.warmup)
+        start = time.perf_counter()
+        latencies, errors, received = drive(port, args.clients, args.duration)
+        elapsed = time.perf_counter() - start
+        workers = [{"pid": pid, "idle_rss_kb": idle[pid], "rss_kb": memory_kb(pid)[0], "peak_rss_kb": memory_kb(pid)[1]} for pid in pids]
+    finally:
+        server.terminate()
+        server.wait(timeout=15)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "mb_per_s": round(received / elapsed / 1e6, 1) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0,
+        "workers": workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--editions", type=int, default=100, help="editions in the fixture payload")
+    parser.add_argument("--stories", type=int, default=12, help="stories per edition")
+    parser.add_argument("--reddit-posts", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds of unmeasured load first")
+    parser.add_argument("--reload-ms", type=int, default=0, help="simulated vol.reload() cost per request")
+    parser.add_argument("--path", choices=["raw", "legacy"], default="raw", help="raw bytes (current) or json.load + re-serialize")
+    parser.add_argument("--no-save", action="store_true", help="don't append to results history")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="glaido-load-") as data_dir:
+        size = write_fixture_payload(data_dir, args.editions, args.stories, args.reddit_posts)
+        print(f"🧪 Fixture payload: {args.editions} editions x {args.stories} stories + {args.reddit_posts} posts ({size / 1e6:.2f} MB)")
+        print(f"🔥 {args.clients} clients -> {args.workers} workers for {args.duration:.0f}s ({args.path} path, reload {args.reload_ms}ms)")
+        result = run(args, data_dir)
+
+    print(f"\n   requests {result['requests']}  errors {result['errors']}  {result['rps']} req/s  {result['mb_per_s']} MB/s")
+    print(f"   latency p50 {result['p50_ms']}ms  p90 {result['p90_ms']}ms  p99 {result['p99_ms']}ms  max {result['max_ms']}ms")
+    for w in result["workers"]:
+        print(f"   worker {w['pid']}: rss {w['rss_kb']} KB (idle {w['idle_rss_kb']} KB, peak {w['peak_rss_kb']} KB)")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+        config = {k: getattr(args, k) for k in ("editions", "stories", "reddit_posts", "workers", "clients", "duration", "reload_ms", "path")}
+        with open(HISTORY_PATH, "a") as f:
+            f.write(json.dumps({"at": datetime.now(timezone.utc).isoformat(), "payload_bytes": size, "config": config, "results": result}) + "\n")
+        print(f"\n📈 Appended results to {os.path.relpath(HISTORY_PATH, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Record/replay fixtures for offline benchmarks.
+
+Fixtures live in `benchmarks/fixtures/` as one body file per URL plus a
+`manifest.json` ({url: {file, status, content_type, kind}}). They come from
+either a live recording (`glaido.net.record_with`) or the seeded synthetic
+generator below, and are served by `ReplayServer`, a local stand-in that
+`glaido.net.route_through` sends every request to. The word generator and
+`percentile` are shared with `load_test.py`.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def normalize(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path or '/'}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def classify(url, content_type):
+    if "json" in content_type or urlparse(url).path.endswith(".json"): return "reddit"
+    if "xml" in content_type or "rss" in content_type or url.endswith(("/feed", ".xml")): return "feed"
+    return "article"
+
+
+class FixtureStore:
+    """URL -> recorded response, backed by files on disk."""
+
+    def __init__(self, root=FIXTURES_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.manifest = {}
+        self.lock = threading.Lock()
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+    def put(self, url, status, content_type, body, kind=None):
+        url = normalize(url)
+        kind = kind or classify(url, content_type)
+        if kind == "article":
+            # Only the head matters for OG extraction; keeps fixtures small
+            end = body.find(b"</head>")
+            if end != -1: body = body[:end + 7] + b"<body></body></html>"
+        name = hashlib.sha1(url.encode()).hexdigest()[:16]
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, name), "wb") as f:
+            f.write(body)
+        with self.lock:
+            self.manifest[url] = {"file": name, "status": status, "content_type": content_type, "kind": kind}
+
+    def get(self, url):
+        entry = self.manifest.get(normalize(url))
+        if not entry: return None
+        with open(os.path.join(self.root, entry["file"]), "rb") as f:
+            return entry["status"], entry["content_type"], f.read()
+
+    def urls(self, kind=None):
+        return [u for u, e in self.manifest.items() if kind is None or e["kind"] == kind]
+
+    def record(self, url, response):
+        """Callback for `glaido.net.record_with`."""
+        self.put(url, response.status_code, response.headers.get("Content-Type", ""), response.content)
+
+    def clear(self):
+        for entry in self.manifest.values():
+            try: os.remove(os.path.join(self.root, entry["file"]))
+            except OSError: pass
+        self.manifest = {}
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.manifest_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    def signature(self):
+        """Short hash of the fixture set so results are only compared like-for-like."""
+        return hashlib.sha1("".join(sorted(e["file"] for e in self.manifest.values())).encode()).hexdigest()[:10]
+
+
+class ReplayServer:
+    """Serves a FixtureStore at `/<scheme>/<host><path>` with optional added latency."""
+
+    def __init__(self, store, latency_ms=0):
+        self.store = store
+        self.latency = latency_ms / 1000
+        self.httpd = None
+
+    def start(self):
+        store, latency = self.store, self.latency
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _serve(self, head=False):
+                if latency: time.sleep(latency)
+                scheme, _, rest = self.path.lstrip("/").partition("/")
+                hit = store.get(f"{scheme}://{rest}")
+                status, ctype, body = hit if hit else (404, "text/plain", b"not recorded")
+                self.send_response(status)
+                self.send_header("Content-Type", ctype or "application/octet-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head: self.wfile.write(body)
+
+            def do_GET(self): self._serve()
+            def do_HEAD(self): self._serve(head=True)
+            def log_message(self, *args): pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values: return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+# --- SYNTHETIC FIXTURES ---
+
+WORDS = ["Model", "Agents", "Launch", "Open", "Source", "Benchmark", "Release", "Vision", "Reasoning", "Startup",
+         "Funding", "Robotics", "Chip", "Inference", "Training", "Safety", "Policy", "Voice", "Search", "Video"]
+
+
+def phrase(rng, n):
+    """n seeded words, lowercase."""
+    return " ".join(rng.choice(WORDS).lower() for _ in range(n))
+
+
+def _headline(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))
+
+
+def _sentence(rng, n=18):
+    return phrase(rng, n).capitalize() + "."
+
+
+def _edition_html(rng, edition, stories, story_urls):
+    parts = [f"<p>{_sentence(rng, 24)} {_sentence(rng, 20)}</p>", f"<p>{_sentence(rng, 22)}</p>"]
+    for i in range(stories):
+        url = f"https://news{rng.randint(0, 40)}.example.com/{edition}/story-{i}"
+        story_urls.append(url)
+        parts.append(f'<h2><a href="{url}">{_headline(rng)}</a></h2>')
+        parts.append(f"<p>{_sentence(rng, 30)}</p>")
+        if i % 4 == 3:
+            # Junk the filters should drop
+            parts.append('<h3><a href="https://sponsor.example.com/x">Our sponsor workshop RSVP today</a></h3><p>Short.</p>')
+        parts.append(f'<p><img src="https://cdn.example.com/{edition}/{i}.png" width="{rng.choice([24, 600])}"></p>')
+    return "\n".join(parts)
+
+
+def _feed_xml(rng, title, editions, stories, story_urls):
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    slug = "".join(c for c in title.lower() if c.isalnum())[:8]
+    items = []
+    for e in range(editions):
+        html = _edition_html(rng, f"{slug}-{e}", stories, story_urls)
+        pub = format_datetime(now - timedelta(days=e))
+        items.append(f"""<item><title>{_headline(rng)}</title><link>https://example.com/p/{slug}-{e}</link>
+<pubDate>{pub}</pubDate><description>{_sentence(rng)}</description>
+<enclosure url="https://cdn.example.com/hero-{e}.jpg" type="image/jpeg" length="0"/>
+<content:encoded><![CDATA[{html}]]></content:encoded></item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>{title}</title>
+<link>https://example.com</link><description>{title}</description>
+{''.join(items)}
+</channel></rss>""".encode()
+
+
+def _article_head(rng, url):
+    filler = "".join(f'<meta name="x-{i}" content="{_sentence(rng, 6)}">' for i in range(40))
+    script = "<script>" + "var a=1;" * rng.randint(500, 3000) + "</script>"
+    return (f'<!doctype html><html><head><title>{_headline(rng)}</title>{filler}{script}'
+            f'<meta property="og:image" content="https://cdn.example.com/og/{hashlib.md5(url.encode()).hexdigest()[:8]}.jpg">'
+            f'<meta name="twitter:image" content="https://cdn.example.com/tw.jpg"></head><body></body></html>').encode()
+
+
+def generate_synthetic(store, feeds, reddit_url, editions=5, stories=12, reddit_posts=10, seed=7):
+    """Fills `store` with deterministic fixtures shaped like the real sources."""
+    rng = random.Random(seed)
+    story_urls = []
+    for url, name in feeds:
+        store.put(url, 200, "application/rss+xml", _feed_xml(rng, name, editions, stories, story_urls), kind="feed")
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    children = []
+    for i in range(reddit_posts):
+        permalink = f"/r/ArtificialInteligence/comments/{i:06x}/post_{i}/"
+        story_urls.append(f"https://www.reddit.com{permalink}")
+        children.append({"data": {
+            "title": _headline(rng), "permalink": permalink, "selftext": _sentence(rng, 40) if i % 2 else "",
+            "created_utc": now - i * 3600, "thumbnail": "self" if i % 3 else f"https://b.thumbs.redditmedia.com/{i}.jpg",
+            "score": rng.randint(1, 500), "num_comments": rng.randint(0, 120), "subreddit": "ArtificialInteligence",
+        }})
+    store.put(reddit_url, 200, "application/json", json.dumps({"data": {"children": children}}).encode(), kind="reddit")
+
+    for url in story_urls:
+        store.put(url, 200, "text/html; charset=utf-8", _article_head(rng, url), kind="article")
+    return store
@@ -0,0 +1,212 @@
+"""Offline benchmark suite for the scrape pipeline.
+
+    python benchmarks/run_benchmarks.py --synthetic          # (re)generate fixtures, then benchmark
+    python benchmarks/run_benchmarks.py --record             # capture live fixtures from a real run
+    python benchmarks/run_benchmarks.py --latency-ms 30      # replay with simulated network latency
+
+Everything is served from the local replay server, so results are comparable
+between runs. Each run is appended to `benchmarks/results/history.jsonl` and
+compared against the previous run on the same fixture set.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("GLAIDO_DATA_DIR", tempfile.mkdtemp(prefix="glaido-bench-"))
+os.environ.setdefault("GLAIDO_FRESHNESS_HOURS", "0")  # fixtures are recorded/dated once, so no freshness cutoff
+
+from bs4 import BeautifulSoup
+import feedparser
+
+import modal_app
+from glaido import enrich, net, parsing, ranking
+from benchmarks.replay import FixtureStore, ReplayServer, generate_synthetic, percentile
+
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "results", "history.jsonl")
+
+
+def unthrottled():
+    """Benchmarks measure our code, not politeness delays to real hosts."""
+    net.reset()
+    net.DEFAULT_RATE = net.BURST = 10_000
+    net.HOST_RATES.clear()
+
+
+def bench(name, fn, items, repeat):
+    """Times fn(item) for every item, `repeat` times, then one traced pass for peak memory."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            unthrottled()
+            for item in items:
+                t = time.perf_counter()
+                fn(item)
+                timings.append(time.perf_counter() - t)
+        total = time.perf_counter() - start
+        unthrottled()
+        tracemalloc.start()
+        for item in items:
+            fn(item)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "ops_per_s": round(len(timings) / total, 1) if total else 0,
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def check_breaker():
+    """Regression check: one URL failing through all its retries must not trip the
+    breaker for the rest of its host."""
+    store = FixtureStore(tempfile.mkdtemp(prefix="glaido-breaker-"))
+    store.put("https://breaker.example.com/bad", 503, "text/plain", b"down", kind="article")
+    store.put("https://breaker.example.com/good", 200, "text/plain", b"ok", kind="article")
+    server = ReplayServer(store)
+    net.route_through(server.start())
+    try:
+        unthrottled()
+        with contextlib.redirect_stdout(io.StringIO()):
+            net.fetch("https://breaker.example.com/bad")
+            response = net.fetch("https://breaker.example.com/good")
+    finally:
+        net.route_through(None)
+        server.stop()
+    if response is None or response.status_code != 200:
+        raise SystemExit("❌ A single failing URL tripped the circuit breaker for its host")
+    print("✅ Breaker check: a failing URL doesn't block its host")
+
+
+def load_inputs(store):
+    """Pre-parsed inputs for the pure-CPU benchmarks."""
+    soups, candidates = [], []
+    for url, name in modal_app.FEEDS:
+        hit = store.get(url)
+        if not hit: continue
+        feed = feedparser.parse(hit[2])
+        for entry in feed.entries:
+            html = entry.get('content', [{}])[0].get('value', entry.get('description', ''))
+            soup = BeautifulSoup(html, 'html.parser')
+            soups.append(soup)
+            for link in soup.find_all('a'):
+                block = link.find_parent(['h2', 'h3', 'strong', 'p']) or link
+                sibling = block.find_next_sibling()
+                candidates.append({"title": link.get_text().strip(), "summary": sibling.get_text().strip() if sibling else "", "source": name})
+    hit = store.get(modal_app.REDDIT_URL)
+    if hit:
+        for post in json.loads(hit[2]).get("data", {}).get("children", []):
+            candidates.append({"title": post["data"].get("title"), "summary": post["data"].get("selftext"), "source": "Reddit"})
+    return soups, candidates
+
+
+def run_suite(store, repeat):
+    soups, candidates = load_inputs(store)
+    article_urls = store.urls("article")
+    results = {}
+    results["scrape_rss_edition"] = bench("scrape_rss_edition", lambda f: modal_app.scrape_rss_edition(*f), modal_app.FEEDS, repeat)
+    results["get_edition_resume"] = bench("get_edition_resume", parsing.get_edition_resume, soups, repeat)
+    results["is_real_article"] = bench("is_real_article", parsing.is_real_article, candidates, repeat)
+    results["get_og_image"] = bench("get_og_image", enrich.get_og_image, article_urls, repeat)
+    results["run_scrapers"] = bench("run_scrapers", lambda _: modal_app._run_pipeline(), [None], repeat)
+    results["rank"] = bench("rank", ranking.rank, [modal_app.load_payload()["articles"]], repeat)
+    return results
+
+
+def git_sha():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def previous_run(signature, latency_ms):
+    if not os.path.exists(HISTORY_PATH): return None
+    last = None
+    with open(HISTORY_PATH) as f:
+        for line in f:
+            run = json.loads(line)
+            if run.get("fixtures") == signature and run.get("latency_ms") == latency_ms:
+                last = run
+    return last
+
+
+def print_table(results, previous):
+    print(f"\n{'benchmark':<20}{'calls':>7}{'ops/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KB':>10}{'Δp50':>9}")
+    for name, r in results.items():
+        delta = ""
+        prev = (previous or {}).get("results", {}).get(name)
+        if prev and prev.get("p50_ms"):
+            delta = f"{(r['p50_ms'] - prev['p50_ms']) / prev['p50_ms'] * 100:+.0f}%"
+        print(f"{name:<20}{r['calls']:>7}{r['ops_per_s']:>11}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['peak_kb']:>10}{delta:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="capture live fixtures from a real pipeline run")
+    parser.add_argument("--synthetic", action="store_true", help="regenerate the seeded synthetic fixtures")
+    parser.add_argument("--editions", type=int, default=5, help="editions per feed (synthetic)")
+    parser.add_argument("--stories", type=int, default=12, help="stories per edition (synthetic)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=0, help="simulated per-request latency")
+    parser.add_argument("--no-save", action="store_true", help="don't append to results history")
+    args = parser.parse_args()
+
+    store = FixtureStore()
+    if args.record:
+        print("🎙️  Recording live fixtures...")
+        store.clear()
+        # The recorder hook only sees requests made in this process
+        parsing.WORKERS = 0
+        net.record_with(store.record)
+        modal_app._run_pipeline()
+        net.record_with(None)
+        store.save()
+        print(f"   ✅ Recorded {len(store.manifest)} responses")
+    elif args.synthetic or not store.manifest:
+        store.clear()
+        generate_synthetic(store, modal_app.FEEDS, modal_app.REDDIT_URL, editions=args.editions, stories=args.stories)
+        store.save()
+        print(f"🧪 Generated {len(store.manifest)} synthetic fixtures")
+
+    check_breaker()
+    server = ReplayServer(store, latency_ms=args.latency_ms)
+    net.route_through(server.start())
+    try:
+        results = run_suite(store, args.repeat)
+    finally:
+        net.route_through(None)
+        server.stop()
+
+    signature = store.signature()
+    print_table(results, previous_run(signature, args.latency_ms))
+    if not args.no_save:
+        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+        with open(HISTORY_PATH, "a") as f:
+            f.write(json.dumps({
+                "at": datetime.now(timezone.utc).isoformat(),
+                "commit": git_sha(),
+                "python": sys.version.split()[0],
+                "fixtures": signature,
+                "latency_ms": args.latency_ms,
+                "results": results,
+            }) + "\n")
+        print(f"\n📈 Appended results to {os.path.relpath(HISTORY_PATH, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo, useCallback, memo } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import {
   Globe,
@@ -16,6 +16,7 @@ import {
   CalendarDays
 } from 'lucide-react'
 import NeuralHeroDemo from './components/NeuralHeroDemo'
+import { useWindowedRows } from './lib/useWindowedRows'
 
 interface Story {
   id: string;
@@ -23,6 +24,7 @@ interface Story {
   url: string;
   summary: string;
   thumbnail: string | null;
+  pending?: boolean; // Enrichment deferred; filled in by enrich_edition on expand
 }
 
 interface Article {
@@ -35,6 +37,7 @@ interface Article {
   summary: string | null; // Keep for backward compatibility/reddit
   published_at: string;
   thumbnail: string | null;
+  thumb?: string | null; // Key of the cached, resized WebP (see get_thumbnail)
   stories: Story[];
 }
 
@@ -43,16 +46,26 @@ interface DashboardData {
   articles: Article[];
 }
 
+const MODAL_URL = 'https://stefanorossiw93--glaido-scraper-get-data.modal.run';
+const THUMB_URL = 'https://stefanorossiw93--glaido-scraper-get-thumbnail.modal.run';
+const ENRICH_URL = 'https://stefanorossiw93--glaido-scraper-enrich-edition.modal.run';
+
+function cardImage(article: Article) {
+  return article.thumb ? `${THUMB_URL}?k=${article.thumb}` : article.thumbnail;
+}
+
+const articleKey = (a: Article) => a.id;
+
 function App() {
   const [data, setData] = useState<DashboardData | null>(null);
   const [loading, setLoading] = useState(true);
   const [expandedEditions, setExpandedEditions] = useState<Set<string>>(new Set());
   const [openCards, setOpenCards] = useState<Set<string>>(new Set());
 
-  // Persistence: Editions and Individual Stories
-  const [savedIds, setSavedIds] = useState<string[]>(() => {
+  // Persistence: Editions and Individual Stories (stored as an array, held as a Set for O(1) lookups)
+  const [savedIds, setSavedIds] = useState<Set<string>>(() => {
     const saved = localStorage.getItem('saved_items');
-    return saved ? JSON.parse(saved) : [];
+    return new Set(saved ? JSON.parse(saved) : []);
   });
 
   const [filter, setFilter] = useState<'all' | 'newsletters' | 'reddit' | 'saved'>('all');
@@ -63,7 +76,6 @@ function App() {
 
   const fetchData = () => {
     setLoading(true);
-    const MODAL_URL = 'https://stefanorossiw93--glaido-scraper-get-data.modal.run';
     fetch(MODAL_URL)
       .then(res => res.json())
       .then(d => {
@@ -83,48 +95,62 @@ function App() {
   };
 
   useEffect(() => {
-    localStorage.setItem('saved_items', JSON.stringify(savedIds));
+    localStorage.setItem('saved_items', JSON.stringify([...savedIds]));
   }, [savedIds]);
 
-  const toggleSave = (id: string, e?: React.MouseEvent) => {
+  // Stable callbacks so memoized cards only re-render when their own props change
+  const toggleSave = useCallback((id: string, e?: React.MouseEvent) => {
     e?.stopPropagation();
-    setSavedIds(prev => prev.includes(id) ? prev.filter(i => i !== id) : [...prev, id]);
-  };
-
-  const isSaved = (id: string) => savedIds.includes(id);
+    setSavedIds(prev => toggled(prev, id));
+  }, []);
 
-  const toggleExpanded = (id: string, e: React.MouseEvent) => {
+  const toggleExpanded = useCallback((id: string, e: React.MouseEvent) => {
     e.stopPropagation();
-    setExpandedEditions(prev => {
-      const next = new Set(prev);
-      if (next.has(id)) next.delete(id); else next.add(id);
-      return next;
-    });
-  };
+    setExpandedEditions(prev => toggled(prev, id));
+  }, []);
 
-  const toggleOpen = (id: string) => {
-    setOpenCards(prev => {
-      const next = new Set(prev);
-      if (next.has(id)) next.delete(id); else next.add(id);
-      return next;
-    });
-  };
+  // Hidden stories are enriched after publishing; fetch them now if the user gets there first
+  const completeEdition = useCallback((id: string) => {
+    fetch(`${ENRICH_URL}?id=${encodeURIComponent(id)}`)
+      .then(res => res.json())
+      .then(({ stories }: { stories: Record<string, string | null> }) => {
+        setData(prev => prev && {
+          ...prev,
+          articles: prev.articles.map(a => a.id !== id ? a : {
+            ...a,
+            stories: a.stories.map(s => s.id in stories ? { ...s, thumbnail: stories[s.id], pending: false } : s)
+          })
+        });
+      })
+      .catch(err => console.error("Failed to complete edition:", err));
+  }, []);
 
-  const filteredArticles = (data?.articles || []).filter(a => {
-    if (filter === 'saved') {
-      // Show edition if saved, OR show edition if ANY of its stories are saved
-      const editionSaved = isSaved(a.id);
-      const storySaved = a.stories?.some(s => isSaved(s.id));
-      return editionSaved || storySaved;
-    }
-    if (filter === 'newsletters') return a.source !== 'Reddit';
-    if (filter === 'reddit') return a.source === 'Reddit';
-    return true;
-  });
+  const toggleOpen = useCallback((id: string) => {
+    setOpenCards(prev => toggled(prev, id));
+  }, []);
+
+  // Source tabs only depend on the data; the saved view is recomputed when pins change
+  const sourceViews = useMemo(() => {
+    const articles = data?.articles || [];
+    return {
+      all: articles,
+      newsletters: articles.filter(a => a.source !== 'Reddit'),
+      reddit: articles.filter(a => a.source === 'Reddit'),
+    };
+  }, [data]);
+
+  const savedView = useMemo(() => {
+    if (filter !== 'saved') return [];
+    // Show edition if saved, OR show edition if ANY of its stories are saved
+    return sourceViews.all.filter(a => savedIds.has(a.id) || a.stories?.some(s => savedIds.has(s.id)));
+  }, [filter, sourceViews, savedIds]);
+
+  const filteredArticles = filter === 'saved' ? savedView : sourceViews[filter];
+  const feed = useWindowedRows(filteredArticles, articleKey);
 
   const stats = {
     total: data?.articles.length || 0,
-    saved: savedIds.length
+    saved: savedIds.size
   };
 
   if (loading && !data) return (
@@ -184,135 +210,28 @@ function App() {
         <NeuralHeroDemo />
       </div>
 
-      <main className="feed-grid">
-        <AnimatePresence mode="popLayout">
-          {filteredArticles.map((article, index) => (
-            <motion.div
-              layout
-              key={article.id}
-              initial={{ opacity: 0, y: 20 }}
-              animate={{ opacity: 1, y: 0 }}
-              transition={{ delay: index * 0.02, layout: { duration: 0.3 } }}
-              className={`article-card cursor-pointer ${article.type === 'edition' ? 'edition-mode' : ''} ${openCards.has(article.id) ? 'is-open' : ''}`}
-              onClick={() => toggleOpen(article.id)}
-            >
-              {/* Image + Overlays */}
-              <div className="image-container relative">
-                {article.thumbnail ? (
-                  <img src={article.thumbnail} alt="" className="article-image" />
-                ) : (
-                  <div className="image-placeholder">
-                    <LayoutGrid size={48} className="text-white opacity-5" />
-                  </div>
-                )}
-
-                {/* Source tag — top left */}
-                <div className="absolute top-4 left-4 source-tag bg-black/60 backdrop-blur-md border border-white/10 uppercase tracking-widest text-[10px] py-1 px-3 rounded-full flex items-center gap-2">
-                  <div className={`w-1.5 h-1.5 rounded-full ${article.source === 'Reddit' ? 'bg-orange-500' : 'bg-[#BFF549]'}`}></div>
-                  {article.source}
-                </div>
-
-                {/* Date badge — bottom left */}
-                <div className="absolute bottom-4 left-4 flex items-center gap-1.5 bg-black/60 backdrop-blur-md border border-white/10 text-[11px] text-white/80 py-1 px-3 rounded-full">
-                  <CalendarDays size={11} className="text-[#BFF549]" />
-                  {formatDate(article.published_at)}
-                </div>
-
-                {/* Save button — top right */}
-                <button
-                  className={`absolute top-4 right-4 p-2 rounded-full transition-all ${isSaved(article.id) ? 'bg-[#BFF549] text-black scale-110' : 'bg-black/40 text-white hover:bg-white/20'}`}
-                  onClick={(e) => { e.stopPropagation(); toggleSave(article.id, e); }}
-                >
-                  <Bookmark size={18} fill={isSaved(article.id) ? "black" : "none"} />
-                </button>
-
-                {/* Expand chevron — bottom right */}
-                <div className={`absolute bottom-4 right-4 p-1.5 rounded-full bg-black/40 backdrop-blur-md transition-transform duration-300 ${openCards.has(article.id) ? 'rotate-180' : ''}`}>
-                  <ChevronDown size={16} className="text-white/60" />
-                </div>
-              </div>
-
-              {/* Always-visible title */}
-              <div className="px-6 pt-5 pb-3">
-                <h3 className="article-title text-xl font-bold leading-tight">{article.title}</h3>
-              </div>
-
-              {/* Expandable body */}
-              <AnimatePresence initial={false}>
-                {openCards.has(article.id) && (
-                  <motion.div
-                    key="body"
-                    initial={{ height: 0, opacity: 0 }}
-                    animate={{ height: 'auto', opacity: 1 }}
-                    exit={{ height: 0, opacity: 0 }}
-                    transition={{ duration: 0.3, ease: [0.16, 1, 0.3, 1] }}
-                    style={{ overflow: 'hidden' }}
-                  >
-                    <div className="card-content pt-0">
-                      {article.type === 'edition' && article.resume && (
-                        <div className="edition-resume">
-                          {article.resume}
-                        </div>
-                      )}
-
-                      {!article.resume && article.summary && (
-                        <p className="article-summary text-muted text-sm line-clamp-3 mb-4">
-                          {article.summary}
-                        </p>
-                      )}
-
-                      {/* NESTED STORIES */}
-                      {article.stories && article.stories.length > 0 && (
-                        <div className="nested-stories-container border-t border-white/5 pt-4 mt-2 space-y-2">
-                          <div className="text-[10px] uppercase font-bold tracking-widest text-muted/60 mb-2 flex items-center gap-2">
-                            <ChevronRight size={12} className="text-[#BFF549]" />
-                            Highlights
-                          </div>
-                          {(expandedEditions.has(article.id) ? article.stories : article.stories.slice(0, 3)).map(story => (
-                            <div key={story.id} className={`story-item group transition-all ${isSaved(story.id) ? 'saved' : ''}`}>
-                              <div className="flex justify-between items-start gap-4">
-                                <div className="flex-1 min-w-0">
-                                  <h4 className="text-[14px] font-semibold text-white/90 group-hover:text-[#BFF549] transition-colors truncate">{story.title}</h4>
-                                  <p className="text-[12px] text-muted line-clamp-1 mt-0.5 opacity-60 leading-relaxed font-mono">{story.summary}</p>
-                                </div>
-                                <div className="flex items-center gap-1 shrink-0">
-                                  <button
-                                    onClick={(e) => toggleSave(story.id, e)}
-                                    className={`p-1.5 rounded-lg transition-all ${isSaved(story.id) ? 'text-[#BFF549]' : 'text-muted/40 hover:text-white'}`}
-                                  >
-                                    <Heart size={14} fill={isSaved(story.id) ? "currentColor" : "none"} />
-                                  </button>
-                                  <a href={story.url} target="_blank" rel="noopener" onClick={e => e.stopPropagation()} className="p-1.5 rounded-lg text-muted/40 hover:text-white">
-                                    <ExternalLink size={14} />
-                                  </a>
-                                </div>
-                              </div>
-                            </div>
-                          ))}
-                          {article.stories.length > 3 && (
-                            <button
-                              onClick={(e) => toggleExpanded(article.id, e)}
-                              className="w-full mt-2 py-2 text-[11px] font-bold text-[#BFF549]/70 hover:text-[#BFF549] border border-white/5 hover:border-[#BFF549]/30 rounded-lg transition-all flex items-center justify-center gap-1.5"
-                            >
-                              <ChevronRight size={12} className={`transition-transform ${expandedEditions.has(article.id) ? 'rotate-90' : ''}`} />
-                              {expandedEditions.has(article.id) ? `Show fewer` : `${article.stories.length - 3} more highlights`}
-                            </button>
-                          )}
-                        </div>
-                      )}
-
-                      <div className="card-footer mt-auto pt-4 flex justify-between items-center" onClick={e => e.stopPropagation()}>
-                        <a href={article.url} target="_blank" rel="noopener" className="flex items-center gap-2 text-[10px] font-black tracking-tighter text-[#BFF549] hover:brightness-125 transition-all ml-auto">
-                          {article.type === 'edition' ? 'FULL NEWSLETTER' : 'FULL SOURCE'} <ChevronRight size={14} />
-                        </a>
-                      </div>
-                    </div>
-                  </motion.div>
-                )}
-              </AnimatePresence>
-            </motion.div>
-          ))}
-        </AnimatePresence>
+      <main className="feed-grid" ref={feed.containerRef}>
+        <div style={{ height: feed.paddingTop }} />
+        {feed.rows.map(row => (
+          <div key={row.key} data-row={row.key} ref={feed.measureRow} className="feed-row" style={{ '--columns': feed.columns } as React.CSSProperties}>
+            {row.items.map((article, col) => (
+              <ArticleCard
+                key={article.id}
+                article={article}
+                delay={col * 0.02}
+                open={openCards.has(article.id)}
+                expanded={expandedEditions.has(article.id)}
+                saved={savedIds.has(article.id)}
+                savedStories={savedStoriesOf(article, savedIds)}
+                onToggleOpen={toggleOpen}
+                onToggleExpanded={toggleExpanded}
+                onToggleSave={toggleSave}
+                onCompleteEdition={completeEdition}
+              />
+            ))}
+          </div>
+        ))}
+        <div style={{ height: feed.paddingBottom }} />
       </main>
 
       {filteredArticles.length === 0 && (
@@ -325,6 +244,165 @@ function App() {
   )
 }
 
+interface ArticleCardProps {
+  article: Article;
+  delay: number;
+  open: boolean;
+  expanded: boolean;
+  saved: boolean;
+  savedStories: string; // comma-joined ids of this card's saved stories
+  onToggleOpen: (id: string) => void;
+  onToggleExpanded: (id: string, e: React.MouseEvent) => void;
+  onToggleSave: (id: string, e?: React.MouseEvent) => void;
+  onCompleteEdition: (id: string) => void;
+}
+
+// Cards get primitive save props (not the whole Set), so memo() only re-renders
+// the card whose item or story was saved
+function savedStoriesOf(article: Article, savedIds: Set<string>) {
+  return (article.stories ?? []).filter(s => savedIds.has(s.id)).map(s => s.id).join(',');
+}
+
+const ArticleCard = memo(function ArticleCard({ article, delay, open, expanded, saved, savedStories, onToggleOpen, onToggleExpanded, onToggleSave, onCompleteEdition }: ArticleCardProps) {
+  const savedStoryIds = useMemo(() => new Set(savedStories.split(',')), [savedStories]);
+  return (
+    <motion.div
+      initial={{ opacity: 0, y: 20 }}
+      animate={{ opacity: 1, y: 0 }}
+      transition={{ delay }}
+      className={`article-card cursor-pointer ${article.type === 'edition' ? 'edition-mode' : ''} ${open ? 'is-open' : ''}`}
+      onClick={() => onToggleOpen(article.id)}
+    >
+      {/* Image + Overlays */}
+      <div className="image-container relative">
+        {article.thumbnail ? (
+          <img src={cardImage(article) ?? undefined} alt="" className="article-image" loading="lazy" decoding="async" />
+        ) : (
+          <div className="image-placeholder">
+            <LayoutGrid size={48} className="text-white opacity-5" />
+          </div>
+        )}
+
+        {/* Source tag — top left */}
+        <div className="absolute top-4 left-4 source-tag bg-black/60 backdrop-blur-md border border-white/10 uppercase tracking-widest text-[10px] py-1 px-3 rounded-full flex items-center gap-2">
+          <div className={`w-1.5 h-1.5 rounded-full ${article.source === 'Reddit' ? 'bg-orange-500' : 'bg-[#BFF549]'}`}></div>
+          {article.source}
+        </div>
+
+        {/* Date badge — bottom left */}
+        <div className="absolute bottom-4 left-4 flex items-center gap-1.5 bg-black/60 backdrop-blur-md border border-white/10 text-[11px] text-white/80 py-1 px-3 rounded-full">
+          <CalendarDays size={11} className="text-[#BFF549]" />
+          {formatDate(article.published_at)}
+        </div>
+
+        {/* Save button — top right */}
+        <button
+          className={`absolute top-4 right-4 p-2 rounded-full transition-all ${saved ? 'bg-[#BFF549] text-black scale-110' : 'bg-black/40 text-white hover:bg-white/20'}`}
+          onClick={(e) => onToggleSave(article.id, e)}
+        >
+          <Bookmark size={18} fill={saved ? "black" : "none"} />
+        </button>
+
+        {/* Expand chevron — bottom right */}
+        <div className={`absolute bottom-4 right-4 p-1.5 rounded-full bg-black/40 backdrop-blur-md transition-transform duration-300 ${open ? 'rotate-180' : ''}`}>
+          <ChevronDown size={16} className="text-white/60" />
+        </div>
+      </div>
+
+      {/* Always-visible title */}
+      <div className="px-6 pt-5 pb-3">
+        <h3 className="article-title text-xl font-bold leading-tight">{article.title}</h3>
+      </div>
+
+      {/* Expandable body */}
+      <AnimatePresence initial={false}>
+        {open && (
+          <motion.div
+            key="body"
+            initial={{ height: 0, opacity: 0 }}
+            animate={{ height: 'auto', opacity: 1 }}
+            exit={{ height: 0, opacity: 0 }}
+            transition={{ duration: 0.3, ease: [0.16, 1, 0.3, 1] }}
+            style={{ overflow: 'hidden' }}
+          >
+            <div className="card-content pt-0">
+              {article.type === 'edition' && article.resume && (
+                <div className="edition-resume">
+                  {article.resume}
+                </div>
+              )}
+
+              {!article.resume && article.summary && (
+                <p className="article-summary text-muted text-sm line-clamp-3 mb-4">
+                  {article.summary}
+                </p>
+              )}
+
+              {/* NESTED STORIES */}
+              {article.stories && article.stories.length > 0 && (
+                <div className="nested-stories-container border-t border-white/5 pt-4 mt-2 space-y-2">
+                  <div className="text-[10px] uppercase font-bold tracking-widest text-muted/60 mb-2 flex items-center gap-2">
+                    <ChevronRight size={12} className="text-[#BFF549]" />
+                    Highlights
+                  </div>
+                  {(expanded ? article.stories : article.stories.slice(0, 3)).map(story => (
+                    <div key={story.id} className={`story-item group transition-all ${savedStoryIds.has(story.id) ? 'saved' : ''}`}>
+                      <div className="flex justify-between items-start gap-4">
+                        {story.thumbnail && (
+                          <img src={story.thumbnail} alt="" className="story-thumb" loading="lazy" decoding="async" onError={e => { e.currentTarget.style.display = 'none'; }} />
+                        )}
+                        <div className="flex-1 min-w-0">
+                          <h4 className="text-[14px] font-semibold text-white/90 group-hover:text-[#BFF549] transition-colors truncate">{story.title}</h4>
+                          <p className="text-[12px] text-muted line-clamp-1 mt-0.5 opacity-60 leading-relaxed font-mono">{story.summary}</p>
+                        </div>
+                        <div className="flex items-center gap-1 shrink-0">
+                          <button
+                            onClick={(e) => onToggleSave(story.id, e)}
+                            className={`p-1.5 rounded-lg transition-all ${savedStoryIds.has(story.id) ? 'text-[#BFF549]' : 'text-muted/40 hover:text-white'}`}
+                          >
+                            <Heart size={14} fill={savedStoryIds.has(story.id) ? "currentColor" : "none"} />
+                          </button>
+                          <a href={story.url} target="_blank" rel="noopener" onClick={e => e.stopPropagation()} className="p-1.5 rounded-lg text-muted/40 hover:text-white">
+                            <ExternalLink size={14} />
+                          </a>
+                        </div>
+                      </div>
+                    </div>
+                  ))}
+                  {article.stories.length > 3 && (
+                    <button
+                      onClick={(e) => {
+                        if (!expanded && article.stories.some(s => s.pending)) onCompleteEdition(article.id);
+                        onToggleExpanded(article.id, e);
+                      }}
+                      className="w-full mt-2 py-2 text-[11px] font-bold text-[#BFF549]/70 hover:text-[#BFF549] border border-white/5 hover:border-[#BFF549]/30 rounded-lg transition-all flex items-center justify-center gap-1.5"
+                    >
+                      <ChevronRight size={12} className={`transition-transform ${expanded ? 'rotate-90' : ''}`} />
+                      {expanded ? `Show fewer` : `${article.stories.length - 3} more highlights`}
+                    </button>
+                  )}
+                </div>
+              )}
+
+              <div className="card-footer mt-auto pt-4 flex justify-between items-center" onClick={e => e.stopPropagation()}>
+                <a href={article.url} target="_blank" rel="noopener" className="flex items-center gap-2 text-[10px] font-black tracking-tighter text-[#BFF549] hover:brightness-125 transition-all ml-auto">
+                  {article.type === 'edition' ? 'FULL NEWSLETTER' : 'FULL SOURCE'} <ChevronRight size={14} />
+                </a>
+              </div>
+            </div>
+          </motion.div>
+        )}
+      </AnimatePresence>
+    </motion.div>
+  );
+});
+
+function toggled(set: Set<string>, id: string) {
+  const next = new Set(set);
+  if (next.has(id)) next.delete(id); else next.add(id);
+  return next;
+}
+
 function formatDate(isoString: string) {
   try {
     const date = new Date(isoString);
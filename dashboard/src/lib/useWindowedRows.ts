@@ -0,0 +1,121 @@
+import { useCallback, useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react'
+
+// Must match .feed-grid in index.css
+const CARD_MIN_WIDTH = 500;
+const GAP = 32;
+
+const ESTIMATED_ROW_HEIGHT = 480;
+const OVERSCAN_PX = 1200;
+
+export interface WindowedRow<T> {
+  key: string;
+  items: T[];
+}
+
+/**
+ * Windowed rendering for the card grid.
+ *
+ * Items are packed into rows of as many columns as the grid fits, and only
+ * the rows near the viewport are mounted; spacers stand in for the rest.
+ * Row heights are measured as rows render (cards expand, so heights vary)
+ * and estimated until then; they are keyed by the row's first item, so a
+ * row keeps its height across tab switches. Scrolling is the page's own.
+ */
+export function useWindowedRows<T>(items: T[], getKey: (item: T) => string) {
+  const [container, setContainer] = useState<HTMLElement | null>(null);
+  const observer = useRef<ResizeObserver | null>(null);
+  const [columns, setColumns] = useState(1);
+  const [range, setRange] = useState({ start: 0, end: 4 });
+  const [heights, setHeights] = useState<Map<string, number>>(() => new Map());
+
+  useLayoutEffect(() => {
+    if (!container) return;
+    const resize = new ResizeObserver(([entry]) => {
+      setColumns(Math.max(1, Math.floor((entry.contentRect.width + GAP) / (CARD_MIN_WIDTH + GAP))));
+    });
+    resize.observe(container);
+    return () => resize.disconnect();
+  }, [container]);
+
+  const rows = useMemo(() => {
+    const out: WindowedRow<T>[] = [];
+    for (let i = 0; i < items.length; i += columns) {
+      out.push({ key: `${columns}:${getKey(items[i])}`, items: items.slice(i, i + columns) });
+    }
+    return out;
+  }, [items, columns, getKey]);
+
+  // offsets[i] = top of row i; offsets[rows.length] = total height
+  const offsets = useMemo(() => {
+    const out = new Array<number>(rows.length + 1);
+    out[0] = 0;
+    for (let i = 0; i < rows.length; i++) {
+      out[i + 1] = out[i] + (heights.get(rows[i].key) ?? ESTIMATED_ROW_HEIGHT) + GAP;
+    }
+    return out;
+  }, [rows, heights]);
+
+  useEffect(() => {
+    let frame = 0;
+    const update = () => {
+      frame = 0;
+      if (!container) return;
+      // Scroll position relative to the top of the feed
+      const top = -container.getBoundingClientRect().top - OVERSCAN_PX;
+      const bottom = top + window.innerHeight + 2 * OVERSCAN_PX;
+      // First row whose bottom is below `top`
+      let lo = 0, hi = rows.length;
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (offsets[mid + 1] <= top) lo = mid + 1; else hi = mid;
+      }
+      const start = lo;
+      let end = start;
+      while (end < rows.length && offsets[end] < bottom) end++;
+      setRange(prev => (prev.start === start && prev.end === end ? prev : { start, end }));
+    };
+    const schedule = () => { if (!frame) frame = requestAnimationFrame(update); };
+    update();
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule);
+    return () => {
+      window.removeEventListener('scroll', schedule);
+      window.removeEventListener('resize', schedule);
+      if (frame) cancelAnimationFrame(frame);
+    };
+  }, [container, rows, offsets]);
+
+  // Ref callback for each rendered row: keeps its measured height current
+  const measureRow = useCallback((el: HTMLElement | null) => {
+    if (!el) return;
+    if (!observer.current) {
+      observer.current = new ResizeObserver(entries => {
+        setHeights(prev => {
+          let next = prev;
+          for (const entry of entries) {
+            const key = (entry.target as HTMLElement).dataset.row!;
+            const height = entry.borderBoxSize?.[0]?.blockSize ?? entry.contentRect.height;
+            if (next.get(key) === height) continue;
+            if (next === prev) next = new Map(prev);
+            next.set(key, height);
+          }
+          return next;
+        });
+      });
+    }
+    const ro = observer.current;
+    ro.observe(el);
+    return () => ro.unobserve(el);
+  }, []);
+
+  const start = Math.min(range.start, rows.length);
+  const end = Math.min(Math.max(range.end, start), rows.length);
+  return {
+    containerRef: setContainer,
+    columns,
+    rows: rows.slice(start, end),
+    measureRow,
+    paddingTop: offsets[start],
+    paddingBottom: Math.max(0, offsets[rows.length] - offsets[end]),
+  };
+}
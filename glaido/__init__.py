@@ -0,0 +1 @@
+"""Shared pipeline helpers used by `modal_app.py` and the scripts in `tools/`."""
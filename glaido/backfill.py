@@ -0,0 +1,138 @@
+"""Multi-edition backfill for the Playwright scrapers.
+
+    python tools/bensbites_scraper.py --backfill --since 2026-10-12
+    python tools/rundown_scraper.py --backfill --url https://www.therundown.ai/p/... --url ...
+
+Posts come from an explicit URL list or from the RSS feed filtered by date
+range (the feeds carry a few weeks of editions, older posts need `--url`).
+They are scraped across a bounded set of pages in one browser context, and
+each finished post is appended to a JSONL file straight away, so an
+interrupted backfill keeps what it has and picks up where it stopped.
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+
+from glaido import feeds, records
+
+CONCURRENCY = 4
+FEED_LIMIT = 50
+BLOCKED_RESOURCES = {"image", "media", "font"}  # the scrapers read img.src, they never need the bytes
+
+
+def parse_date(value):
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc) if value else None
+
+
+def select_posts(feed_url, since=None, until=None, urls=None):
+    """Posts to backfill: the given URLs, or feed posts published in [since, until]
+    (as returned by `feeds.discover_posts`, so they carry the feed HTML too)."""
+    if urls: return [{"url": u, "published_at": None} for u in urls]
+    posts = []
+    for post in feeds.discover_posts(feed_url, limit=FEED_LIMIT):
+        published = post["published_at"]
+        if published is None: continue
+        if since and published < since: continue
+        if until and published > until: continue
+        posts.append(post)
+    return posts
+
+
+def done_urls(path):
+    """Post URLs already written to a backfill file."""
+    done = set()
+    try:
+        with open(path) as f:
+            for line in f:
+                try: done.add(json.loads(line)["post_url"])
+                except (ValueError, KeyError): pass  # a torn last line from an interrupted run
+    except OSError: pass
+    return done
+
+
+def pending(posts, path):
+    done = done_urls(path)
+    return [p for p in posts if p["url"] not in done]
+
+
+def append_result(path, post_url, articles):
+    with open(path, "a") as f:
+        f.write(json.dumps({"post_url": post_url, "articles": articles}, default=records.wire) + "\n")
+
+
+def read_articles(path):
+    """Every article record written to a backfill file so far."""
+    articles = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try: articles.extend(json.loads(line)["articles"])
+                except (ValueError, KeyError): pass
+    except OSError: pass
+    return records.load_items(articles)
+
+
+def extract_from_feed(posts, source_name, out_path):
+    """Writes out every post whose full HTML is in the feed, so only the rest need a page."""
+    for post in pending(posts, out_path):
+        articles = feeds.articles_from_post(post, source_name)
+        if articles: append_result(out_path, post["url"], articles)
+
+
+async def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCES: await route.abort()
+    else: await route.continue_()
+
+
+async def scrape_all(context, posts, scrape_one, out_path, concurrency=CONCURRENCY):
+    """Scrapes posts with `scrape_one(page, post) -> [articles]` on up to
+    `concurrency` pages of one context, appending each post's articles to
+    `out_path` as it finishes. Returns the number of posts scraped."""
+    queue = asyncio.Queue()
+    for post in pending(posts, out_path): queue.put_nowait(post)
+    if queue.empty(): return 0
+    await context.route("**/*", block_heavy_resources)
+    scraped = 0
+
+    async def worker():
+        nonlocal scraped
+        page = await context.new_page()
+        try:
+            while not queue.empty():
+                post = queue.get_nowait()
+                try:
+                    articles = await scrape_one(page, post)
+                except Exception as e:
+                    print(f"⚠️ Backfill failed for {post['url']}: {e}")
+                    continue
+                append_result(out_path, post["url"], articles)
+                scraped += 1
+                print(f"   ✅ {post['url']}: {len(articles)} articles")
+        finally:
+            await page.close()
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, queue.qsize()))))
+    return scraped
+
+
+def parse_args(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--backfill", action="store_true", help="scrape several editions instead of the latest one")
+    parser.add_argument("--since", help="backfill posts published on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="backfill posts published on/before this date (YYYY-MM-DD)")
+    parser.add_argument("--url", action="append", dest="urls", help="post URL to backfill (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="pages scraped at once")
+    parser.add_argument("--out", help="JSONL output file (default .tmp/<source>_backfill.jsonl)")
+    parser.add_argument("--force-render", action="store_true", help="always render posts in Chromium")
+    args = parser.parse_args()
+    inclusive_end = args.until and len(args.until) == 10  # a bare date covers the whole day
+    args.since, args.until = parse_date(args.since), parse_date(args.until)
+    if inclusive_end: args.until = args.until.replace(hour=23, minute=59, second=59)
+    return args
+
+
+def default_out(name):
+    os.makedirs(".tmp", exist_ok=True)
+    return os.path.join(".tmp", f"{name}_backfill.jsonl")
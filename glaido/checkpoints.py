@@ -0,0 +1,111 @@
+"""Per-run checkpoints on the volume, so a retried run resumes instead of
+starting over.
+
+`run_scrapers` saves each completed unit under `runs/<run_id>/` as it goes
+(one file per source, then the enrichment progress) and commits the volume
+after every save. When Modal retries the function after a timeout or a dead
+container, `start` picks up the newest unfinished run and the pipeline skips
+whatever that run already has. The same files let a failing run publish
+what it has so far. Each start counts an attempt in the manifest; a run out
+of attempts is marked failed, so a later run starts fresh instead.
+"""
+import json
+import os
+import re
+import time
+import uuid
+
+from glaido import records
+
+RESUME_WINDOW = 6 * 3600  # older unfinished runs are abandoned rather than resumed
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+class RunCheckpoint:
+    def __init__(self, root, run_id, on_save=None):
+        self.root = root
+        self.run_id = run_id
+        self.dir = os.path.join(root, run_id)
+        self.on_save = on_save  # e.g. vol.commit, so progress survives the container
+        os.makedirs(self.dir, exist_ok=True)
+        self.manifest = self._read("manifest") or {"run_id": run_id, "started": time.time(), "status": "running", "stages": []}
+        self.resumed = bool(self.manifest["stages"])
+
+    @property
+    def attempts(self):
+        return self.manifest.get("attempts", 0)
+
+    def attempt(self):
+        """Counts a (re)start of this run."""
+        self.manifest["attempts"] = self.attempts + 1
+        self._write("manifest", self.manifest)
+        if self.on_save: self.on_save()
+        return self
+
+    def _path(self, stage):
+        return os.path.join(self.dir, f"{stage}.json")
+
+    def _read(self, stage):
+        try:
+            with open(self._path(stage)) as f: return json.load(f)
+        except (OSError, ValueError): return None
+
+    def _write(self, stage, data):
+        tmp = self._path(stage) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, default=records.wire)
+        os.replace(tmp, self._path(stage))
+
+    def has(self, stage):
+        return stage in self.manifest["stages"]
+
+    def save(self, stage, data):
+        self._write(stage, data)
+        if stage not in self.manifest["stages"]: self.manifest["stages"].append(stage)
+        self._write("manifest", self.manifest)
+        if self.on_save: self.on_save()
+
+    def load(self, stage):
+        return self._read(stage) if self.has(stage) else None
+
+    def load_items(self, stage):
+        return records.load_items(self.load(stage) or [])
+
+    def finish(self, status="done"):
+        """Marks the run finished and drops its stage files (only the manifest stays)."""
+        for stage in self.manifest["stages"]:
+            try: os.remove(self._path(stage))
+            except OSError: pass
+        self.manifest["status"] = status
+        self.manifest["finished"] = time.time()
+        self._write("manifest", self.manifest)
+        if self.on_save: self.on_save()
+
+
+def resumable(root, now=None):
+    """Run ID of the newest unfinished run started within RESUME_WINDOW, or None."""
+    now = now or time.time()
+    best = None
+    try: entries = os.listdir(root)
+    except OSError: return None
+    for entry in entries:
+        try:
+            with open(os.path.join(root, entry, "manifest.json")) as f: manifest = json.load(f)
+        except (OSError, ValueError): continue
+        if manifest.get("status") != "running" or now - manifest.get("started", 0) > RESUME_WINDOW: continue
+        if best is None or manifest["started"] > best["started"]: best = manifest
+    return best["run_id"] if best else None
+
+
+def start(root, on_save=None, resume=True, max_attempts=None):
+    """Resumes the newest unfinished run, or starts a new one. A run that already
+    had `max_attempts` (e.g. its last one timed out) is marked failed instead."""
+    run_id = resumable(root) if resume else None
+    if run_id:
+        ckpt = RunCheckpoint(root, run_id, on_save)
+        if max_attempts is None or ckpt.attempts < max_attempts: return ckpt.attempt()
+        ckpt.finish("failed")
+    return RunCheckpoint(root, uuid.uuid4().hex[:12], on_save).attempt()
@@ -0,0 +1,84 @@
+"""OG-image enrichment for editions, stories and posts.
+
+`enrich_chunk` is the work unit the executors ship around: a list of small
+{url, thumbnail} dicts in, the resolved thumbnails out. Locally chunks run on
+threads of the calling process (the fetching stays there, only OG-head
+parsing goes to the process pool). Items are grouped by
+host inside a chunk and each host is fetched on its own thread, one request
+after another, so it keeps a single warm connection and its rate limit.
+Items are handled in the order given, so callers put the most visible first
+and pass a deadline to cut the rest off.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+
+from glaido import net, parsing, tracing
+
+HOST_THREADS = 10
+GENERIC_FRAGMENTS = ['substack.com/image/fetch', 'bensbites.com/logo', 'therundown.ai/logo', 'redditfast', 'reddit.com/static', 'redditstatic.com']
+
+
+def get_youtube_thumbnail(url):
+    try:
+        if "youtube.com" in url or "youtu.be" in url:
+            video_id = None
+            if "youtu.be" in url:
+                video_id = url.split("/")[-1].split("?")[0]
+            else:
+                qs = parse_qs(urlparse(url).query)
+                video_id = qs.get("v", [None])[0]
+            if video_id: return f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+    except: pass
+    return None
+
+
+def get_og_image(url):
+    try:
+        if not url or not url.startswith('http') or "twitter.com" in url or "x.com" in url: return None
+        yt_thumb = get_youtube_thumbnail(url)
+        if yt_thumb: return yt_thumb
+        response = net.fetch(url, timeout=10)
+        if response is None or response.status_code != 200: return None
+        head = parsing.head_of(response.content)
+        with tracing.span("og_parse", bytes=len(head)):
+            return parsing.run(parsing.extract_og_image, head)
+    except: return None
+
+
+def enrich_article(article):
+    """Enriches an individual story with a thumbnail if missing or generic."""
+    current_thumb = article.get('thumbnail')
+    url = article.get('url')
+    if not url: return article
+    is_generic = current_thumb and any(f in current_thumb for f in GENERIC_FRAGMENTS)
+    if not current_thumb or is_generic:
+        new_img = get_og_image(url)
+        if new_img: article['thumbnail'] = new_img
+        elif is_generic: article['thumbnail'] = None
+    return article
+
+
+def host_of(url):
+    return urlparse(url or "").netloc.lower()
+
+
+def enrich_chunk(articles, deadline=None):
+    """Work unit: [{url, thumbnail}] -> ([thumbnail], [done]) in the same order.
+    Items not reached by `deadline` (epoch seconds) keep their thumbnail and
+    come back with done=False."""
+    results = [a.get('thumbnail') for a in articles]
+    done = [False] * len(articles)
+    by_host = {}
+    for i, a in enumerate(articles):
+        by_host.setdefault(host_of(a.get('url')), []).append(i)
+
+    def run_host(indices):
+        for i in indices:
+            if deadline and time.time() > deadline: return
+            results[i] = enrich_article(dict(articles[i])).get('thumbnail')
+            done[i] = True
+
+    with ThreadPoolExecutor(max_workers=max(1, min(HOST_THREADS, len(by_host)))) as executor:
+        list(executor.map(tracing.bind(run_host), by_host.values()))
+    return results, done
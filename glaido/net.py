@@ -0,0 +1,259 @@
+"""Shared outbound HTTP layer.
+
+Every fetch goes through `fetch()`, which adds per-host token buckets, retries
+with jittered backoff on 429/5xx and a circuit breaker that skips hosts after
+repeated failed fetches (each fetch counts once, after its retries; 429s only
+slow the host down). Failing hosts are remembered for the lifetime of the
+process, so one slow host can't hold a worker for the full timeout on every
+story of a run.
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from glaido import tracing
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5      # seconds, doubled per attempt
+BACKOFF_CAP = 8.0
+
+DEFAULT_RATE = 4.0      # requests/second per host
+MIN_RATE = 0.25
+BURST = 4
+
+BREAKER_THRESHOLD = 3   # consecutive failed fetches (after their retries) before a host is skipped
+BREAKER_COOLDOWN = 120  # seconds before a half-open probe is allowed
+
+# Hosts we hit a lot with known limits
+HOST_RATES = {
+    "www.reddit.com": 1.0,
+    "img.youtube.com": 8.0,
+}
+
+
+class HostState:
+    """Token bucket, circuit breaker and counters for a single host."""
+
+    def __init__(self, host):
+        self.host = host
+        self.rate = HOST_RATES.get(host, DEFAULT_RATE)
+        self.tokens = float(BURST)
+        self.updated = time.monotonic()
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False  # a half-open probe is in flight
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "retries": 0, "skipped": 0, "throttled": 0, "bytes": 0}
+        self.latencies = []
+
+    def acquire(self):
+        """Blocks until a token is available. Returns False if the breaker is open."""
+        probe = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if self.opened_at is not None and not probe:
+                    if now - self.opened_at < BREAKER_COOLDOWN or self.probing:
+                        self.stats["skipped"] += 1
+                        return False
+                    # Half-open: this caller is the single probe; everyone else stays
+                    # rejected until `record` sees how it went
+                    self.probing = probe = True
+                self.tokens = min(BURST, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats["requests"] += 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def record(self, ok, elapsed, nbytes=0, throttled=False, final=True):
+        """Records one attempt. Only a `final` failure (the fetch has no retries
+        left) counts towards the breaker, and a 429 never does: the rate
+        halving handles it."""
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.stats["bytes"] += nbytes
+            if throttled:
+                # Multiplicative decrease on 429, additive increase on success
+                self.stats["throttled"] += 1
+                self.rate = max(MIN_RATE, self.rate / 2)
+            if self.probing:
+                # The half-open probe closes the breaker, or re-opens it for another cooldown
+                self.probing = False
+                self.opened_at = None if ok or throttled else time.monotonic()
+            if ok:
+                self.stats["ok"] += 1
+                self.failures = 0
+                self.rate = min(HOST_RATES.get(self.host, DEFAULT_RATE), self.rate + 0.1)
+            else:
+                self.stats["errors"] += 1
+                if throttled or not final: return
+                self.failures += 1
+                if self.failures >= BREAKER_THRESHOLD and self.opened_at is None:
+                    self.opened_at = time.monotonic()
+                    print(f"   ⛔ Circuit open for {self.host} after {self.failures} failures")
+
+    def snapshot(self):
+        with self.lock:
+            lat = sorted(self.latencies)
+            out = dict(self.stats)
+            out["rate"] = round(self.rate, 2)
+            out["circuit_open"] = self.opened_at is not None
+            if lat:
+                out["p50_ms"] = round(lat[len(lat) // 2] * 1000)
+                out["p95_ms"] = round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000)
+                out["max_ms"] = round(lat[-1] * 1000)
+            return out
+
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+_local = threading.local()
+
+# Offline replay hooks (see benchmarks/replay.py)
+_route_base = None
+_recorder = None
+
+
+def route_through(base_url):
+    """Sends every request to a local stand-in server as `<base>/<scheme>/<host><path>`.
+    Host state stays keyed on the original host. Pass None to go live again."""
+    global _route_base
+    _route_base = base_url.rstrip("/") if base_url else None
+
+
+def record_with(callback):
+    """Calls `callback(url, response)` for every completed response (None to stop)."""
+    global _recorder
+    _recorder = callback
+
+
+def worker_config():
+    """Routing and rate settings to re-apply in pool worker processes."""
+    return {"route_base": _route_base, "default_rate": DEFAULT_RATE, "burst": BURST, "host_rates": dict(HOST_RATES)}
+
+
+def configure(cfg):
+    global _route_base, DEFAULT_RATE, BURST
+    _route_base, DEFAULT_RATE, BURST = cfg["route_base"], cfg["default_rate"], cfg["burst"]
+    HOST_RATES.clear()
+    HOST_RATES.update(cfg["host_rates"])
+
+
+def _target(url):
+    if not _route_base: return url
+    parsed = urlparse(url)
+    return f"{_route_base}/{parsed.scheme}/{parsed.netloc}{parsed.path or '/'}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def host_state(host):
+    with _hosts_lock:
+        state = _hosts.get(host)
+        if state is None:
+            state = _hosts[host] = HostState(host)
+        return state
+
+
+def _session():
+    # requests.Session isn't guaranteed thread-safe; one per worker thread still reuses connections
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = _local.session = requests.Session()
+        s.headers.update(DEFAULT_HEADERS)
+    return s
+
+
+def _retry_delay(attempt, response=None):
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(BACKOFF_CAP, float(retry_after))
+    # Full jitter
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def fetch(url, method="GET", timeout=10, retries=MAX_RETRIES, **kwargs):
+    """Fetches a URL through the shared layer. Returns the Response, or None if the
+    host is tripped, retries are exhausted or the request raised."""
+    host = urlparse(url).netloc.lower()
+    if not host: return None
+    state = host_state(host)
+    with tracing.span("http", host=host, method=method) as sp:
+        for attempt in range(retries + 1):
+            sp["attempts"] = attempt + 1
+            if not state.acquire():
+                sp["outcome"] = "circuit_open"
+                return None
+            start = time.monotonic()
+            try:
+                response = _session().request(method, _target(url), timeout=timeout, allow_redirects=True, **kwargs)
+            except requests.RequestException as e:
+                state.record(False, time.monotonic() - start, final=attempt >= retries)
+                sp["outcome"] = type(e).__name__
+                if attempt < retries:
+                    state.count("retries")
+                    time.sleep(_retry_delay(attempt))
+                    continue
+                return None
+            elapsed = time.monotonic() - start
+            sp["status"] = response.status_code
+            if _recorder: _recorder(url, response)
+            if response.status_code in RETRY_STATUSES:
+                state.record(False, elapsed, throttled=response.status_code == 429, final=attempt >= retries)
+                sp["outcome"] = f"http_{response.status_code}"
+                if attempt < retries:
+                    state.count("retries")
+                    time.sleep(_retry_delay(attempt, response))
+                    continue
+                return response
+            nbytes = len(response.content) if method != "HEAD" else 0
+            state.record(True, elapsed, nbytes=nbytes)
+            sp["outcome"] = "ok"
+            sp["bytes"] = nbytes
+            return response
+        return None
+
+
+def metrics():
+    """Per-host counters and latency percentiles for everything fetched so far."""
+    with _hosts_lock:
+        states = list(_hosts.values())
+    return {s.host: s.snapshot() for s in states}
+
+
+def export():
+    """Raw per-host counters and latencies, for a remote worker to send back (see `absorb`)."""
+    with _hosts_lock:
+        states = list(_hosts.values())
+    out = {}
+    for s in states:
+        with s.lock:
+            out[s.host] = {"stats": dict(s.stats), "latencies": list(s.latencies)}
+    return out
+
+
+def absorb(exported):
+    """Adds another process's `export()` to this process's metrics."""
+    for host, data in exported.items():
+        s = host_state(host)
+        with s.lock:
+            for key, value in data["stats"].items(): s.stats[key] = s.stats.get(key, 0) + value
+            s.latencies.extend(data["latencies"])
+
+
+def reset():
+    """Forgets all host state (rates, breakers and metrics)."""
+    with _hosts_lock:
+        _hosts.clear()
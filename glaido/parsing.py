@@ -0,0 +1,212 @@
+"""CPU-bound HTML parsing, run in a process pool.
+
+Parsing in `scrape_rss_edition` and `get_og_image` is pure Python under the
+GIL, so the enrichment threads only overlap network wait. The functions here
+take raw bytes/strings and return compact dicts or strings, so they can be
+shipped to worker processes cheaply while the network side stays in threads.
+"""
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from glaido import net
+
+# 0 = parse inline in the calling thread (no pool)
+WORKERS = int(os.environ.get("GLAIDO_PARSE_WORKERS", os.cpu_count() or 1))
+
+SKIP_STORY_HOSTS = ['bensbites.com', 'therundown.ai', 'substack.com', 'beehiiv.com', 'twitter.com', 'x.com']
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Lazily starts the shared process pool (None when disabled)."""
+    global _pool
+    if WORKERS <= 1: return None
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: safe to start from a process that already runs threads
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=ctx, initializer=_worker_init, initargs=(net.worker_config(),))
+        return _pool
+
+
+def _worker_init(net_config):
+    # Work units run inside a worker parse inline rather than starting pools of their own
+    global WORKERS
+    WORKERS = 0
+    net.configure(net_config)
+
+
+def run(fn, *args):
+    """Runs fn(*args) on the pool and waits; inline when the pool is disabled."""
+    pool = get_pool()
+    if pool is None: return fn(*args)
+    return pool.submit(fn, *args).result()
+
+
+def imap_units(fn, units):
+    """Maps fn over argument tuples on the pool, yielding results in order as they finish."""
+    pool = get_pool()
+    if pool is None or len(units) < 2: return (fn(*u) for u in units)
+    return pool.map(fn, *zip(*units))
+
+
+def map_units(fn, units):
+    return list(imap_units(fn, units))
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def head_of(content):
+    """Trims an HTML document to its <head>; OG/twitter meta tags live there."""
+    end = content[:512 * 1024].lower().find(b"</head>")
+    return content[:end + 7] if end != -1 else content
+
+
+# --- FILTERS ---
+
+
+def is_real_article(article):
+    """Refined filtering for individual stories."""
+    if not article: return False
+    title = (article.get('title') or '').strip()
+    summary = (article.get('summary') or '').strip()
+    
+    if len(title) < 15: return False
+    # Reject titles that look like sentence fragments (end with comma or are all lowercase)
+    if title.endswith(',') or title.endswith(':') or title.endswith(';'): return False
+    # Title should read like a headline: starts with uppercase, contains at least 2 words
+    words = title.split()
+    if len(words) < 3: return False
+    # If the title starts lowercase it's likely a fragment of surrounding text
+    if title[0].islower(): return False
+    # Reject if title has too many lowercase function words as a proportion (likely a sentence fragment)
+    # A real headline has ≥ 1 word capitalized beyond the first
+    capitalized_count = sum(1 for w in words if w and w[0].isupper())
+    if capitalized_count < 1: return False
+
+    title_lower = title.lower()
+    ui_phrases = ['see example', 'live example', 'read more', 'click here', 'follow on', 'view on', 'subscribe', 'newsletter', 'sign up', 'unsubscribe']
+    if any(p in title_lower for p in ui_phrases): return False
+
+    block_words = ['rsvp', 'workshop', 'webinar', 'sponsor', 'partner', 'ad ', 'advertisement', 'referral', 'free credits', 'get $', 'off deal', 'job board', 'hiring', 'careers', 'legal', 'tos', 'terms', 'archives', 'feedback', 'survey', 'community highlights', 'good morning', 'in today']
+    if any(word in title_lower for word in block_words): return False
+    
+    if article.get('source') != "Reddit" and len(summary) < 40: return False
+
+    return True
+
+
+def get_edition_resume(soup):
+    """Extracts a 2-3 sentence teaser/resume from the first substantial text blocks."""
+    paragraphs = []
+    # Look for the first few paragraphs that aren't too short or navigational
+    for p in soup.find_all(['p', 'div']):
+        text = p.get_text().strip()
+        # Skip short snippets, ads, or header junk
+        if len(text) > 60 and not any(x in text.lower() for x in ['subscribe', 'view in browser', 'read online']):
+            # Clean up extra whitespace/newlines
+            clean_text = re.sub(r'\s+', ' ', text)
+            paragraphs.append(clean_text)
+            if len(paragraphs) >= 2: break
+    
+    resume = " ".join(paragraphs)
+    if len(resume) > 350:
+        resume = resume[:347] + "..."
+    return resume
+
+
+# --- WORK UNITS ---
+
+
+def extract_og_image(content):
+    """Best og:image / twitter:image from raw HTML bytes, or None."""
+    soup = BeautifulSoup(content, 'html.parser')
+    candidates = []
+    for tag in soup.find_all("meta"):
+        prop = (tag.get("property") or "").lower()
+        name = (tag.get("name") or "").lower()
+        content = tag.get("content", "")
+        if not content: continue
+        if prop in ["og:image", "og:image:url"]: candidates.append((10, content))
+        elif name in ["twitter:image", "twitter:image:src"]: candidates.append((8, content))
+    if not candidates: return None
+    candidates.sort(key=lambda x: x[0], reverse=True)
+    return candidates[0][1]
+
+
+def parse_edition(html_content, lead_image, source_name):
+    """Parses one edition's HTML into {lead_image, resume, stories}.
+    `lead_image` is the enclosure/feed image found by the caller, if any."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # Fallback: First large image in soup (avoid tiny icons)
+    if not lead_image:
+        for img in soup.find_all('img'):
+            src = img.get('src')
+            width = img.get('width', '500') # Assume large if no width
+            if src and src.startswith('http') and int(re.sub(r'\D', '', str(width)) or 500) > 100:
+                lead_image = src
+                break
+
+    resume = get_edition_resume(soup)
+
+    sub_stories = []
+    # Newsletters often use h2 or strong links for main stories
+    potential_story_containers = soup.find_all(['h2', 'h3', 'strong'])
+
+    for container in potential_story_containers:
+        link = container.find('a') if hasattr(container, 'find') else None
+        # If not in h2/h3, maybe it's just an <a> tag that's prominent
+        if not link and container.name == 'a': link = container
+
+        if not link: continue
+
+        href = link.get('href')
+        if not href or not href.startswith('http') or any(x in href.lower() for x in SKIP_STORY_HOSTS):
+            continue
+
+        title = link.get_text().strip()
+        if len(title) < 15: continue
+
+        # Extract summary by looking at subsequent siblings
+        summary_parts = []
+        curr = container
+        # If it's a strong tag inside a p, move up to p
+        if curr.name == 'strong' and curr.parent and curr.parent.name == 'p':
+            curr = curr.parent
+
+        limit = 0
+        sibling = curr.next_sibling
+        while sibling and limit < 3:
+            txt = sibling.get_text().strip() if hasattr(sibling, 'get_text') else str(sibling).strip()
+            if txt and len(txt) > 20:
+                summary_parts.append(txt)
+                if len(txt) > 80: break # Found a good paragraph
+            sibling = sibling.next_sibling
+            limit += 1
+
+        sub_stories.append({"title": title, "url": href, "summary": " ".join(summary_parts)[:400]})
+
+    # Filter stories to ensure high quality, then dedupe by URL
+    seen_urls = set()
+    stories = []
+    for s in sub_stories:
+        if s['url'] in seen_urls: continue
+        if not is_real_article({"title": s['title'], "summary": s['summary'], "source": source_name}): continue
+        stories.append(s)
+        seen_urls.add(s['url'])
+
+    return {"lead_image": lead_image, "resume": resume, "stories": stories[:12]}
@@ -0,0 +1,189 @@
+"""Relevance ranking for cards and stories, scored in one NumPy batch.
+
+Every edition header, edition story and Reddit post is a row of a feature
+matrix: cross-source duplicate count, Reddit upvotes and comments (log
+scaled), and keyword hits in the title. A row's base weight is its source
+weight times (1 + features @ WEIGHTS), and its score decays with age:
+
+    score = base * 0.5 ** (age_hours / HALF_LIFE_HOURS)
+
+Because the decay is the same for every row, the order never changes with
+time. Rows are compared on the time-invariant key
+`log(base) + decay_rate * published`, so a top-K kept from an earlier batch
+stays valid and new rows can be merged into it (`TopK`) without rescoring the
+old ones. `score` is only `exp(key - decay_rate * now)`.
+
+`rank(items)` sets `rank` on every item and story and returns the cards in
+ranked order (a card ranks by its best row) plus the top stories. The
+publish step runs it, so the payload ships precomputed.
+"""
+import math
+import re
+import time
+
+import numpy as np
+
+from glaido import records
+
+HALF_LIFE_HOURS = 12
+DECAY_RATE = math.log(2) / (HALF_LIFE_HOURS * 3600)  # per second
+SOURCE_WEIGHTS = {"Ben's Bites": 1.0, "The Rundown AI": 1.0, "Reddit": 0.6}
+DEFAULT_SOURCE_WEIGHT = 0.8
+KEYWORDS = (
+    "openai", "anthropic", "claude", "gemini", "gpt", "llama", "mistral", "deepseek",
+    "agent", "model", "launch", "release", "open source", "open-source", "funding", "raises",
+    "benchmark", "reasoning", "robot", "chip", "nvidia",
+)
+# Weights for the columns of `features`: duplicates, log upvotes, log comments, keyword hits
+WEIGHTS = np.array([0.6, 0.15, 0.1, 0.2])
+TOP_K = 20
+
+_KEYWORD_PATTERNS = [re.compile(re.escape(k)) for k in KEYWORDS]
+
+
+def url_key(url):
+    """A URL without scheme, www., query, fragment or trailing slash, for duplicate matching."""
+    url = url.lower().partition("#")[0].partition("?")[0].rstrip("/")
+    return url.split("://", 1)[-1].removeprefix("www.")
+
+
+def rows(items):
+    """Flattens cards into rows. Returns (records, card index per row, columns dict).
+    Per-card values are broadcast with np.repeat, and strings are factorized to
+    ints here so the batch math never sorts strings."""
+    recs = [r for item in items for r in (item, *item.stories)]
+    sizes = np.fromiter((1 + len(item.stories) for item in items), dtype=np.int64, count=len(items))
+    heads = np.concatenate([[0], np.cumsum(sizes)[:-1]])  # row of each card's own header
+    source_index, url_index = {}, {}
+    published, source_ids, upvotes, comments = [], [], np.zeros(len(recs)), np.zeros(len(recs))
+    for item in items:
+        dt = records.parse_published(item.published_at)
+        published.append(dt.timestamp() if dt else time.time())
+        source_ids.append(source_index.setdefault(item.source, len(source_index)))
+    upvotes[heads] = [item.upvotes or 0 for item in items]
+    comments[heads] = [item.comments or 0 for item in items]
+    weights = np.array([SOURCE_WEIGHTS.get(name, DEFAULT_SOURCE_WEIGHT) for name in source_index])
+    source_ids = np.repeat(np.array(source_ids, dtype=np.int64), sizes)
+    return recs, np.repeat(np.arange(len(items)), sizes), {
+        "published": np.repeat(np.array(published, dtype=np.float64), sizes),
+        "source_id": source_ids,
+        "weight": weights[source_ids] if len(weights) else np.zeros(0),
+        "url_id": np.array([url_index.setdefault(url_key(r.url), len(url_index)) for r in recs], dtype=np.int64),
+        "title": [r.title for r in recs],
+        "upvotes": upvotes,
+        "comments": comments,
+    }
+
+
+def duplicates(url_ids, source_ids):
+    """For each row, how many other sources carry the same URL."""
+    if not len(url_ids): return np.zeros(0)
+    width = source_ids.max() + 1
+    pairs = np.unique(url_ids * width + source_ids)  # distinct (url, source)
+    sources_per_url = np.bincount(pairs // width, minlength=url_ids.max() + 1)
+    return sources_per_url[url_ids] - 1
+
+
+def keyword_hits(titles):
+    """Distinct keywords per title. Each keyword is one scan over all titles joined;
+    match positions map back to rows with a searchsorted."""
+    hits = np.zeros(len(titles))
+    if not titles: return hits
+    titles = [t.lower() for t in titles]  # before measuring: lowercasing can change a title's length ("İ")
+    text = "\n".join(titles)
+    lengths = np.fromiter((len(t) + 1 for t in titles), dtype=np.int64, count=len(titles))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    for pattern in _KEYWORD_PATTERNS:
+        positions = np.fromiter((m.start() for m in pattern.finditer(text)), dtype=np.int64)
+        if len(positions): hits[np.unique(np.searchsorted(starts, positions, side="right") - 1)] += 1
+    return hits
+
+
+def features(cols):
+    return np.column_stack([
+        duplicates(cols["url_id"], cols["source_id"]),
+        np.log1p(cols["upvotes"]),
+        np.log1p(cols["comments"]),
+        keyword_hits(cols["title"]),
+    ])
+
+
+def keys(cols):
+    """Time-invariant ranking keys (higher is better) for a batch of rows."""
+    base = cols["weight"] * (1 + features(cols) @ WEIGHTS)
+    return np.log(base) + DECAY_RATE * cols["published"]
+
+
+def best(row_keys, k):
+    """Indices of the k highest keys (unordered)."""
+    if len(row_keys) <= k: return np.arange(len(row_keys))
+    return np.argpartition(-row_keys, k - 1)[:k]
+
+
+def scores(row_keys, now=None):
+    return np.exp(row_keys - DECAY_RATE * (now or time.time()))
+
+
+def entries(items, recs, card, picks):
+    return [{"id": recs[i].id, "title": recs[i].title, "url": recs[i].url,
+             "source": items[card[i]].source, "published_at": items[card[i]].published_at} for i in picks]
+
+
+def rank(items, now=None, k=TOP_K):
+    """Sets `rank` on every card and story. Returns (cards best-first, TopK of all rows)."""
+    if not items: return [], TopK(k)
+    recs, card, cols = rows(items)
+    row_keys = keys(cols)
+    for r, s in zip(recs, scores(row_keys, now).round(4).tolist()): r.rank = s
+    card_keys = np.full(len(items), -np.inf)
+    np.maximum.at(card_keys, card, row_keys)
+    for item, s in zip(items, scores(card_keys, now).round(4).tolist()): item.rank = s
+    ranked = [items[i] for i in np.argsort(-card_keys, kind="stable")]
+    picks = best(row_keys, k)
+    return ranked, TopK(k).push(entries(items, recs, card, picks), row_keys[picks])
+
+
+class TopK:
+    """The K best rows seen so far, as {id, title, url, source, published_at} entries with their
+    keys. Merging a batch only touches the new rows and the current K, so the
+    archive's top list grows incrementally (see `compact_history`)."""
+
+    def __init__(self, k=TOP_K, entries=(), row_keys=()):
+        self.k = k
+        self.entries = np.array(list(entries), dtype=object)
+        self.keys = np.array(row_keys, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, new_entries, row_keys):
+        batch = np.empty(len(new_entries), dtype=object)
+        batch[:] = list(new_entries)
+        pool = np.concatenate([self.entries, batch])
+        row_keys = np.concatenate([self.keys, np.asarray(row_keys, dtype=np.float64)])
+        # A re-pushed id keeps its latest entry
+        _, last = np.unique(np.array([e["id"] for e in pool[::-1]], dtype=object), return_index=True)
+        keep = len(pool) - 1 - last
+        pool, row_keys = pool[keep], row_keys[keep]
+        picks = best(row_keys, self.k)
+        pool, row_keys = pool[picks], row_keys[picks]
+        order = np.argsort(-row_keys, kind="stable")
+        self.entries, self.keys = pool[order], row_keys[order]
+        return self
+
+    def push_items(self, items):
+        """Scores a batch of cards (duplicates are counted within the batch) and merges their rows in."""
+        if not items: return self
+        recs, card, cols = rows(items)
+        row_keys = keys(cols)
+        picks = best(row_keys, self.k)
+        return self.push(entries(items, recs, card, picks), row_keys[picks])
+
+    def to_wire(self, now=None):
+        """Best-first entries, each with its time-invariant `key` and current `score`."""
+        current = scores(self.keys, now).round(4).tolist()
+        return [dict(e, key=round(k, 6), score=s) for e, k, s in zip(self.entries.tolist(), self.keys.tolist(), current)]
+
+    @classmethod
+    def from_wire(cls, wire, k=TOP_K):
+        return cls(k, [{n: v for n, v in e.items() if n not in ("key", "score")} for e in wire], [e["key"] for e in wire])
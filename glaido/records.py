@@ -0,0 +1,181 @@
+"""Typed records for pipeline items and the stories inside editions.
+
+Editions (newsletter issues) and articles (Reddit posts, flat newsletter
+stories from the local scrapers) share one `Item` record; an edition's
+stories are `Story` records. Both use `__slots__`, so a large backfill costs a
+fraction of the per-dict memory, and source names are interned so thousands
+of items share one string per source.
+
+The schema is checked once, when a record is built from scraped data or
+loaded from a stored payload. Inside the pipeline fields are plain
+attributes; the dashboard's JSON shape is only produced by `to_wire` when a
+payload is written (`json.dump(..., default=records.wire)`).
+
+Records are not frozen: enrichment and thumbnail caching fill in
+`thumbnail` / `thumb` in place after the record is built. `pending` marks a
+record whose enrichment was deferred (see `enrich_items` in modal_app.py); it
+is only written to the wire while true. `rank` is the relevance score
+precomputed at publish time (see glaido/ranking.py).
+"""
+import sys
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+TYPES = ("edition", "article")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+def _require(record, *names):
+    for name in names:
+        value = getattr(record, name)
+        if not isinstance(value, str) or not value.strip():
+            raise SchemaError(f"{type(record).__name__}.{name} must be a non-empty string, got {value!r}")
+
+
+def _optional(record, *names):
+    for name in names:
+        value = getattr(record, name)
+        if value is not None and not isinstance(value, str):
+            raise SchemaError(f"{type(record).__name__}.{name} must be a string or None, got {value!r}")
+
+
+def _count(record, *names):
+    for name in names:
+        value = getattr(record, name)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            raise SchemaError(f"{type(record).__name__}.{name} must be an int or None, got {value!r}")
+
+
+def parse_published(value):
+    """UTC datetime from `published_at` (ISO 8601, or an RFC 822 date straight from a feed), or None."""
+    try: dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        try: dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError): return None
+    if dt.tzinfo is None: dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+@dataclass(slots=True, eq=False)
+class Story:
+    title: str
+    url: str
+    summary: str = ""
+    thumbnail: str = None
+    pending: bool = False
+    rank: float = None
+    id: str = field(default_factory=new_id)
+
+    def __post_init__(self):
+        _require(self, "title", "url")
+        _optional(self, "summary", "thumbnail")
+
+    def to_wire(self):
+        d = {"id": self.id, "title": self.title, "url": self.url, "summary": self.summary or "", "thumbnail": self.thumbnail}
+        if self.pending: d["pending"] = True
+        if self.rank is not None: d["rank"] = self.rank
+        return d
+
+    @classmethod
+    def from_wire(cls, d):
+        return cls(title=d.get("title"), url=d.get("url"), summary=d.get("summary") or "", thumbnail=d.get("thumbnail"),
+                   pending=bool(d.get("pending")), rank=d.get("rank"), id=d.get("id") or new_id())
+
+
+@dataclass(slots=True, eq=False)
+class Item:
+    type: str
+    title: str
+    source: str
+    url: str
+    published_at: str
+    summary: str = None       # an edition's resume, a post's text
+    thumbnail: str = None     # source image URL
+    thumb: str = None         # key of the cached WebP (see glaido/thumbnails.py)
+    pending: bool = False
+    upvotes: int = None       # Reddit score
+    comments: int = None      # Reddit comment count
+    rank: float = None
+    stories: tuple = ()
+    id: str = field(default_factory=new_id)
+
+    def __post_init__(self):
+        if self.type not in TYPES: raise SchemaError(f"Item.type must be one of {TYPES}, got {self.type!r}")
+        _require(self, "title", "source", "url", "published_at")
+        _optional(self, "summary", "thumbnail", "thumb")
+        _count(self, "upvotes", "comments")
+        if self.stories and self.type != "edition": raise SchemaError("Only editions have stories")
+        self.type = sys.intern(self.type)
+        self.source = sys.intern(self.source)
+        self.stories = tuple(self.stories)
+
+    def to_wire(self):
+        d = {
+            "id": self.id,
+            "type": self.type,
+            "title": self.title,
+            "source": self.source,
+            "url": self.url,
+            "summary": self.summary,
+            "published_at": self.published_at,
+            "thumbnail": self.thumbnail,
+            "thumb": self.thumb,
+            "stories": [s.to_wire() for s in self.stories],
+        }
+        if self.type == "edition": d["resume"] = self.summary  # the dashboard reads `resume` on edition cards
+        if self.pending: d["pending"] = True
+        for name in ("upvotes", "comments", "rank"):
+            if getattr(self, name) is not None: d[name] = getattr(self, name)
+        return d
+
+    @classmethod
+    def from_wire(cls, d):
+        return cls(
+            type=d.get("type") or "article",
+            title=d.get("title"),
+            source=d.get("source"),
+            url=d.get("url"),
+            published_at=d.get("published_at"),
+            summary=d.get("resume") or d.get("summary"),
+            thumbnail=d.get("thumbnail"),
+            thumb=d.get("thumb"),
+            pending=bool(d.get("pending")),
+            upvotes=d.get("upvotes"),
+            comments=d.get("comments"),
+            rank=d.get("rank"),
+            stories=[Story.from_wire(s) for s in d.get("stories") or []],
+            id=d.get("id") or new_id(),
+        )
+
+
+def wire(obj):
+    """`default=` hook for json.dump: records serialize themselves on write."""
+    if isinstance(obj, (Item, Story)): return obj.to_wire()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def stories_from(dicts):
+    """Story records from parser output, skipping any that fail validation."""
+    stories = []
+    for d in dicts:
+        try: stories.append(Story(**d))
+        except SchemaError: pass
+    return stories
+
+
+def load_items(dicts):
+    """Items from stored wire dicts; entries that fail validation are dropped."""
+    items = []
+    for d in dicts:
+        try: items.append(Item.from_wire(d))
+        except SchemaError as e: print(f"   ⚠️ Dropping invalid stored item: {e}")
+    return items
@@ -0,0 +1,164 @@
+"""Retention and compaction for what accumulates on the volume.
+
+The payload only holds the newest few items per source. Items that drop out
+of it are appended to `archive/spool.jsonl` when a payload is published, and
+the daily `compact_history` job (modal_app.py) rolls the spool into one
+gzipped JSON file per UTC publish day (`archive/2026-10-19.json.gz`, deduped by
+URL), folding the new ones into `archive/top.json`, the best-ranked stories
+across the archive. The same job deletes day archives older than
+ARCHIVE_DAYS, per-run files (timing reports, profiles, checkpoints) older
+than RUNS_DAYS and cached thumbnails the payload no longer references, so
+storage stays bounded however long the app runs.
+"""
+import glob
+import gzip
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+from glaido import ranking, records
+
+ARCHIVE_DAYS = 90
+RUNS_DAYS = 7
+THUMB_GRACE = 24 * 3600  # an unreferenced thumb this new may belong to a run that hasn't published yet
+SPOOL = "spool.jsonl"
+TOP = "top.json"  # best stories across the archive (glaido/ranking.py)
+
+
+def day_of(published_at):
+    """UTC day of a `published_at` value."""
+    dt = records.parse_published(published_at)
+    return dt.strftime("%Y-%m-%d") if dt else "undated"
+
+
+def evicted(old, merged):
+    """Items of the previous payload that a merge dropped (replaced URLs don't count)."""
+    kept = {i.url for i in merged}
+    return [i for i in old if i.url not in kept]
+
+
+def spool(items, archive_dir):
+    """Appends items to the spool; cheap enough to do on every publish."""
+    if not items: return
+    os.makedirs(archive_dir, exist_ok=True)
+    with open(os.path.join(archive_dir, SPOOL), "a") as f:
+        for item in items: f.write(json.dumps(item, default=records.wire) + "\n")
+
+
+def read_archive(path):
+    try:
+        with gzip.open(path, "rt") as f: return json.load(f)
+    except (OSError, ValueError, EOFError): return []
+
+
+def write_archive(path, dicts):
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt") as f:
+        json.dump(dicts, f)
+    os.replace(tmp, path)
+
+
+def compact_spool(archive_dir):
+    """Rolls spooled items into per-day gzip archives. Returns {day: newly archived items}."""
+    path = os.path.join(archive_dir, SPOOL)
+    # Claim the spool first, so items spooled meanwhile wait for the next compaction
+    if os.path.exists(path): os.replace(path, f"{path}.{int(time.time())}.compacting")
+    claimed = sorted(glob.glob(f"{path}.*.compacting"))  # includes leftovers from an interrupted job
+    by_day = {}
+    for spooled in claimed:
+        with open(spooled) as f:
+            dicts = []
+            for line in f:
+                try: dicts.append(json.loads(line))
+                except ValueError: pass  # a torn last line
+        for item in records.load_items(dicts): by_day.setdefault(day_of(item.published_at), []).append(item)
+
+    added = {}
+    for day, items in by_day.items():
+        day_path = os.path.join(archive_dir, f"{day}.json.gz")
+        archived = {d.get("url"): d for d in read_archive(day_path)}
+        added[day] = list({i.url: i for i in items if i.url not in archived}.values())
+        for item in items: archived[item.url] = item.to_wire()  # the later copy wins
+        write_archive(day_path, list(archived.values()))
+    for spooled in claimed: os.remove(spooled)
+    return added
+
+
+def archive_cutoff(now=None):
+    return datetime.fromtimestamp((now or time.time()) - ARCHIVE_DAYS * 86400, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def update_top(archive_dir, items, now=None):
+    """Folds newly archived items into the archive's top stories, without rereading
+    the day files; entries from pruned days are dropped."""
+    path = os.path.join(archive_dir, TOP)
+    try:
+        with open(path) as f: top = ranking.TopK.from_wire(json.load(f))
+    except (OSError, ValueError, KeyError): top = ranking.TopK()
+    top.push_items(items)
+    cutoff = archive_cutoff(now)
+    wire = [e for e in top.to_wire(now) if day_of(e["published_at"]) >= cutoff]
+    os.makedirs(archive_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(wire, f, indent=2)
+    os.replace(tmp, path)
+    return wire
+
+
+def prune_archives(archive_dir, now=None):
+    cutoff = archive_cutoff(now)
+    removed = 0
+    for path in glob.glob(os.path.join(archive_dir, "*.json.gz")):
+        day = os.path.basename(path)[:-len(".json.gz")]
+        if day < cutoff:  # "undated" sorts after any date, so it is kept
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def prune_runs(runs_dir, now=None):
+    """Removes timing reports, profiles and checkpoint dirs older than RUNS_DAYS."""
+    cutoff = (now or time.time()) - RUNS_DAYS * 86400
+    removed = 0
+    try: entries = os.listdir(runs_dir)
+    except OSError: return 0
+    for entry in entries:
+        path = os.path.join(runs_dir, entry)
+        try:
+            if os.path.getmtime(path) > cutoff: continue
+            if os.path.isdir(path): shutil.rmtree(path)
+            else: os.remove(path)
+            removed += 1
+        except OSError: pass
+    return removed
+
+
+def prune_thumbs(thumbs_dir, keep, now=None):
+    """Removes cached thumbnails whose key isn't in `keep`, once past THUMB_GRACE."""
+    cutoff = (now or time.time()) - THUMB_GRACE
+    removed = 0
+    for path in glob.glob(os.path.join(thumbs_dir, "*.webp")):
+        if os.path.basename(path)[:-len(".webp")] in keep: continue
+        try:
+            if os.path.getmtime(path) > cutoff: continue
+            os.remove(path)
+            removed += 1
+        except OSError: pass
+    return removed
+
+
+def compact(data_dir, items, now=None):
+    """The whole retention pass over a data dir; `items` is the published payload."""
+    archive_dir = os.path.join(data_dir, "archive")
+    archived = compact_spool(archive_dir)
+    top = update_top(archive_dir, [i for day_items in archived.values() for i in day_items], now)
+    return {
+        "archived": {day: len(day_items) for day, day_items in archived.items()},
+        "top": top,
+        "archives_pruned": prune_archives(archive_dir, now),
+        "runs_pruned": prune_runs(os.path.join(data_dir, "runs"), now),
+        "thumbs_pruned": prune_thumbs(os.path.join(data_dir, "thumbs"), {i.thumb for i in items if i.thumb}, now),
+    }
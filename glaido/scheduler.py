@@ -0,0 +1,103 @@
+"""Adaptive per-source polling.
+
+`poll_sources` in `modal_app.py` wakes up every few minutes, but each source
+is only fetched when it is due. A source's interval is learned from the
+publish times seen in its feed (newsletters go quiet until shortly before the
+next expected edition, busy sources are polled often) and stretched when
+polls keep coming back empty (HTTP 304 or no unseen entries). State lives in
+a small JSON file on the volume.
+"""
+import json
+import os
+import statistics
+import time
+
+MIN_INTERVAL = 10 * 60
+MAX_INTERVAL = 6 * 3600
+DEFAULT_INTERVAL = 60 * 60
+TICK = 15 * 60              # how often poll_sources runs; sources due within half a tick are polled now
+WINDOW = 0.2                # start polling this fraction of a gap before the next expected publish
+MAX_PUBLISHED = 40          # publish timestamps kept per source
+EMPTY_DECAY = 0.8           # EWMA weight for the empty-poll rate
+
+
+def load_state(path):
+    try:
+        with open(path) as f: return json.load(f)
+    except (OSError, ValueError): return {}
+
+
+def save_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def source_state(state, name):
+    return state.setdefault(name, {
+        "interval": DEFAULT_INTERVAL, "next_due": 0, "etag": None, "last_modified": None,
+        "published": [], "empty_rate": 0.0, "polls": 0, "not_modified": 0, "new_polls": 0,
+    })
+
+
+def is_due(st, now=None):
+    now = now or time.time()
+    return st["next_due"] <= now + TICK / 2
+
+
+def conditional_headers(st):
+    headers = {}
+    if st.get("etag"): headers["If-None-Match"] = st["etag"]
+    if st.get("last_modified"): headers["If-Modified-Since"] = st["last_modified"]
+    return headers
+
+
+def learned_gap(st):
+    """Median seconds between consecutive publishes, or None if unknown."""
+    published = sorted(set(st["published"]))
+    gaps = [b - a for a, b in zip(published, published[1:]) if b > a]
+    return statistics.median(gaps) if gaps else None
+
+
+def next_interval(st, now, min_interval=MIN_INTERVAL):
+    gap = learned_gap(st)
+    # The more polls come back empty, the less often we ask
+    interval = (gap / 8 if gap else DEFAULT_INTERVAL) * (1 + st["empty_rate"])
+    if gap:
+        wake = max(st["published"]) + gap * (1 - WINDOW)
+        if now < wake:
+            # Quiet period: sleep until shortly before the next expected publish
+            interval = max(interval, wake - now)
+    return int(min(MAX_INTERVAL, max(min_interval, interval)))
+
+
+def record_poll(st, response=None, new_count=0, published=(), now=None, min_interval=MIN_INTERVAL):
+    """Updates a source's state after a poll and schedules its next one."""
+    now = now or time.time()
+    st["polls"] += 1
+    if response is not None:
+        if response.status_code == 304:
+            st["not_modified"] += 1
+        else:
+            st["etag"] = response.headers.get("ETag") or st.get("etag")
+            st["last_modified"] = response.headers.get("Last-Modified") or st.get("last_modified")
+    if new_count: st["new_polls"] += 1
+    st["empty_rate"] = round(EMPTY_DECAY * st["empty_rate"] + (1 - EMPTY_DECAY) * (0 if new_count else 1), 3)
+    st["published"] = sorted(set(st["published"]) | {int(p) for p in published})[-MAX_PUBLISHED:]
+    st["interval"] = next_interval(st, now, min_interval)
+    st["last_polled"] = int(now)
+    st["next_due"] = int(now + st["interval"])
+    return st
+
+
+def summary(state):
+    """One line per source for logs."""
+    lines = []
+    for name, st in state.items():
+        gap = learned_gap(st)
+        lines.append(
+            f"{name}: every {st['interval'] // 60}m (gap {round(gap / 3600, 1) if gap else '?'}h, "
+            f"{st['not_modified']}/{st['polls']} 304s, empty rate {st['empty_rate']:.2f})"
+        )
+    return lines
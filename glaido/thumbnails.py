@@ -0,0 +1,105 @@
+"""Thumbnail validation and resizing cache.
+
+Card images in the payload point at full-size originals (YouTube
+maxresdefault, Reddit preview sources, newsletter heroes) or at dead links.
+`process()` checks each candidate with a HEAD (or 1-byte ranged GET), stores a
+small WebP on the volume keyed by URL hash, and records that key on the item
+as `thumb` so the dashboard can load it from the cached image endpoint.
+
+A thumbnail is only dropped when it is definitely broken: a 4xx, or bytes
+that don't decode as an image. No answer, a 429/5xx or an open circuit says
+nothing about the image, so the original URL is kept and retried next run.
+"""
+import hashlib
+import io
+import os
+
+from glaido import net, parsing
+
+MAX_SIZE = (640, 360)   # cards render at ~400px wide; leaves room for 1.5x screens
+WEBP_QUALITY = 72
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+
+
+def thumb_key(url):
+    # serve_app.THUMB_KEY_RE relies on this exact shape (20 hex chars)
+    return hashlib.sha1(url.encode()).hexdigest()[:20]
+
+
+def thumb_path(thumbs_dir, key):
+    return os.path.join(thumbs_dir, f"{key}.webp")
+
+
+def outcome(response):
+    """"ok", "broken" (a definite 4xx) or None if the response says nothing definite."""
+    if response is None: return None
+    if response.status_code in (200, 206): return "ok"
+    if 400 <= response.status_code < 500 and response.status_code != 429: return "broken"
+    return None
+
+
+def probe(url):
+    """`outcome` of the URL, checked without downloading it. The content-type isn't
+    trusted (images are often served as application/octet-stream); decoding decides."""
+    response = net.fetch(url, method="HEAD", timeout=5, retries=1)
+    if response is None or response.status_code in (403, 405, 501):
+        # Some CDNs reject HEAD; a 1-byte ranged GET is the next cheapest probe
+        response = net.fetch(url, timeout=5, retries=1, headers={"Range": "bytes=0-0"})
+    return outcome(response)
+
+
+def resize_to_webp(content):
+    """Raw image bytes -> WebP bytes no bigger than MAX_SIZE (runs on the parse pool)."""
+    from PIL import Image
+    with Image.open(io.BytesIO(content)) as img:
+        img.draft("RGB", MAX_SIZE)  # cheap JPEG downscale while decoding
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        img.thumbnail(MAX_SIZE)
+        out = io.BytesIO()
+        img.save(out, "WEBP", quality=WEBP_QUALITY, method=4)
+        return out.getvalue()
+
+
+def candidates(url):
+    """URLs to try for a thumbnail, best first."""
+    if "img.youtube.com" in url and url.endswith("/maxresdefault.jpg"):
+        # Cards never need maxres, and it is missing for many videos; hqdefault always exists
+        return [url.replace("/maxresdefault.jpg", "/hqdefault.jpg"), url]
+    return [url]
+
+
+def cache_thumbnail(url, thumbs_dir):
+    """Returns (cache key, source URL to keep). Without a cached copy the key is
+    None and the original URL is kept, unless every candidate is definitely
+    broken, in which case both are None."""
+    keep = None
+    for candidate in candidates(url):
+        key = thumb_key(candidate)
+        if os.path.exists(thumb_path(thumbs_dir, key)): return key, candidate
+        status = probe(candidate)
+        if status == "ok":
+            response = net.fetch(candidate, timeout=15)
+            status = outcome(response)
+        if status == "ok":
+            if len(response.content) > MAX_SOURCE_BYTES:
+                status = None  # a real image, just too big to cache
+            else:
+                try:
+                    webp = parsing.run(resize_to_webp, response.content)
+                except Exception:
+                    status = "broken"  # not an image, or a corrupt one
+                else:
+                    tmp = thumb_path(thumbs_dir, key) + ".tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(webp)
+                    os.replace(tmp, thumb_path(thumbs_dir, key))
+                    return key, candidate
+        if status is None: keep = url
+    return None, keep
+
+
+def process_item(item, thumbs_dir):
+    """Sets `thumb` on a card record and drops the thumbnail if it is broken."""
+    if not item.thumbnail: return item
+    item.thumb, item.thumbnail = cache_thumbnail(item.thumbnail, thumbs_dir)
+    return item
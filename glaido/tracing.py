@@ -0,0 +1,176 @@
+"""Run-level spans and timing reports for the scrape pipeline.
+
+A run calls `start_run()`, wraps stages/sources/requests in `span(...)`, and
+saves `report()` next to the payload. When no run is active `span()` is a
+no-op, so library code can be instrumented unconditionally.
+"""
+import contextvars
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+_active = None
+_parent = contextvars.ContextVar("glaido_span_parent", default=None)
+
+
+class Tracer:
+    """Collects finished spans for a single run."""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.t0 = time.perf_counter()
+        self.spans = []
+        self.lock = threading.Lock()
+        self._ids = 0
+
+    def _next_id(self):
+        with self.lock:
+            self._ids += 1
+            return self._ids
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Times the enclosed block. Yields the attrs dict so callers can add
+        fields (bytes, status, count...) before it closes."""
+        span_id = self._next_id()
+        parent = _parent.get()
+        token = _parent.set(span_id)
+        start = time.perf_counter()
+        attrs.setdefault("outcome", "ok")
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["outcome"] = "error"
+            attrs["error"] = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            _parent.reset(token)
+            record = {
+                "id": span_id,
+                "parent": parent,
+                "name": name,
+                "start_ms": round((start - self.t0) * 1000, 2),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "thread": threading.current_thread().name,
+            }
+            record.update(attrs)
+            with self.lock:
+                self.spans.append(record)
+
+    def summary(self):
+        """Count/total/percentiles per span name."""
+        by_name = {}
+        with self.lock:
+            for s in self.spans:
+                by_name.setdefault(s["name"], []).append(s)
+        out = {}
+        for name, spans in by_name.items():
+            durations = sorted(s["duration_ms"] for s in spans)
+            n = len(durations)
+            out[name] = {
+                "count": n,
+                "total_ms": round(sum(durations), 2),
+                "p50_ms": durations[n // 2],
+                "p95_ms": durations[min(n - 1, int(n * 0.95))],
+                "max_ms": durations[-1],
+                "bytes": sum(s.get("bytes") or 0 for s in spans),
+                "errors": sum(1 for s in spans if s.get("outcome") != "ok"),
+            }
+        return out
+
+    def report(self):
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ms"])
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "total_ms": round((time.perf_counter() - self.t0) * 1000, 2),
+            "summary": self.summary(),
+            "spans": spans,
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+def start_run(run_id=None):
+    """Starts a new run and makes it the target for module-level `span()`."""
+    global _active
+    _active = Tracer(run_id)
+    return _active
+
+
+def current():
+    return _active
+
+
+def adopt(spans):
+    """Adds spans recorded in another process under the current span, with fresh ids.
+    Clocks differ between processes, so they are shifted to end now."""
+    tracer = _active
+    if tracer is None or not spans: return
+    parent = _parent.get()
+    ids = {s["id"]: tracer._next_id() for s in spans}
+    offset = (time.perf_counter() - tracer.t0) * 1000 - max(s["start_ms"] + s["duration_ms"] for s in spans)
+    adopted = [dict(s, id=ids[s["id"]], parent=ids.get(s["parent"], parent), start_ms=round(s["start_ms"] + offset, 2), remote=True)
+               for s in spans]
+    with tracer.lock:
+        tracer.spans.extend(adopted)
+
+
+def bind(fn):
+    """Wraps fn so calls from pool threads nest under the caller's current span
+    (threads don't inherit contextvars). Each call runs in its own copy of the
+    caller's context, so one wrapper can be mapped concurrently."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Module-level span on the active run; a no-op when tracing is off."""
+    tracer = _active
+    if tracer is None:
+        yield attrs
+        return
+    with tracer.span(name, **attrs) as a:
+        yield a
+
+
+@contextmanager
+def profiled(mode, out_prefix):
+    """Optional per-run profiler. `mode` is None, "cprofile" or "pyinstrument";
+    output goes to `<out_prefix>.prof` / `<out_prefix>.html`."""
+    if not mode:
+        yield None
+        return
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("   ⚠️ pyinstrument not installed, falling back to cProfile")
+            mode = "cprofile"
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield profiler
+            finally:
+                profiler.stop()
+                with open(f"{out_prefix}.html", "w") as f:
+                    f.write(profiler.output_html())
+            return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{out_prefix}.prof")
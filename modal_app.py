@@ -1,316 +1,449 @@
 import modal
 import json
 import os
-import uuid
-import asyncio
+import time
 from datetime import datetime, timezone
-import requests
-from bs4 import BeautifulSoup
 import concurrent.futures
-import re
-from urllib.parse import urlparse, parse_qs
+
+from glaido import checkpoints, enrich, executors, feeds, net, parsing, ranking, records, retention, scheduler, thumbnails, tracing
+from glaido.records import Item
+import serve_app
 
 # Configuration
 app = modal.App("glaido-scraper")
 vol = modal.Volume.from_name("glaido-data", create_if_missing=True)
+DATA_DIR = os.environ.get("GLAIDO_DATA_DIR", "/data")  # Volume mount; overridden for local/offline runs
 
 # Image setup (Playwright no longer needed for Newsletters, but kept for future niche scrapers/Reddit expansion)
 image = (
     modal.Image.debian_slim(python_version="3.10")
-    .pip_install("requests", "beautifulsoup4", "playwright", "fastapi[standard]", "feedparser")
+    .pip_install("requests", "beautifulsoup4", "playwright", "fastapi[standard]", "feedparser", "pillow", "numpy")
     .run_commands("playwright install chromium")
     .run_commands("playwright install-deps chromium")
+    .add_local_python_source("glaido", "serve_app")
 )
 
-# --- UTILS ---
+# Read-only endpoints (get_data, get_thumbnail) live in serve_app.py on a lean image
+app.include(serve_app.app)
 
-def get_youtube_thumbnail(url):
-    try:
-        if "youtube.com" in url or "youtu.be" in url:
-            video_id = None
-            if "youtu.be" in url:
-                video_id = url.split("/")[-1].split("?")[0]
-            else:
-                qs = parse_qs(urlparse(url).query)
-                video_id = qs.get("v", [None])[0]
-            if video_id: return f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-    except: pass
-    return None
+# Sources
+FEEDS = [
+    (feeds.BENSBITES_FEED, "Ben's Bites"),
+    (feeds.RUNDOWN_FEED, "The Rundown AI")
+]
+REDDIT_URL = "https://www.reddit.com/r/ArtificialInteligence/new.json?limit=10"
+EDITIONS_PER_FEED = 5
+REDDIT_MIN_INTERVAL = 30 * 60  # busy, but each poll re-downloads the listing
+VISIBLE_STORIES = 3  # stories the dashboard shows per edition until "Show More"
+ENRICH_BUDGET = 60  # seconds for the priority enrichment pass before publishing
+RUN_TIMEOUT = 1200
+RUN_BUDGET = RUN_TIMEOUT - 180  # past this, a run stops starting new work and publishes what it has
+RUN_RETRIES = 2  # Modal retries of run_scrapers; each resumes the same checkpointed run
 
-def get_og_image(url):
-    try:
-        if not url or not url.startswith('http') or "twitter.com" in url or "x.com" in url: return None
-        yt_thumb = get_youtube_thumbnail(url)
-        if yt_thumb: return yt_thumb
-        headers = { 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36' }
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-        if response.status_code != 200: return None
-        soup = BeautifulSoup(response.text, 'html.parser')
-        candidates = []
-        for tag in soup.find_all("meta"):
-            prop = (tag.get("property") or "").lower()
-            name = (tag.get("name") or "").lower()
-            content = tag.get("content", "")
-            if not content: continue
-            if prop in ["og:image", "og:image:url"]: candidates.append((10, content))
-            elif name in ["twitter:image", "twitter:image:src"]: candidates.append((8, content))
-        if not candidates: return None
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        return candidates[0][1]
-    except: return None
-
-def enrich_article(article):
-    """Enriches an individual story with a thumbnail if missing or generic."""
-    current_thumb = article.get('thumbnail')
-    url = article.get('url')
-    if not url: return article
-    generic_fragments = ['substack.com/image/fetch', 'bensbites.com/logo', 'therundown.ai/logo', 'redditfast', 'reddit.com/static', 'redditstatic.com']
-    is_generic = current_thumb and any(f in current_thumb for f in generic_fragments)
-    if not current_thumb or is_generic:
-        new_img = get_og_image(url)
-        if new_img: article['thumbnail'] = new_img
-        elif is_generic: article['thumbnail'] = None
-    return article
-
-def is_real_article(article):
-    """Refined filtering for individual stories."""
-    if not article: return False
-    title = (article.get('title') or '').strip()
-    summary = (article.get('summary') or '').strip()
-    
-    if len(title) < 15: return False
-    # Reject titles that look like sentence fragments (end with comma or are all lowercase)
-    if title.endswith(',') or title.endswith(':') or title.endswith(';'): return False
-    # Title should read like a headline: starts with uppercase, contains at least 2 words
-    words = title.split()
-    if len(words) < 3: return False
-    # If the title starts lowercase it's likely a fragment of surrounding text
-    if title[0].islower(): return False
-    # Reject if title has too many lowercase function words as a proportion (likely a sentence fragment)
-    # A real headline has ≥ 1 word capitalized beyond the first
-    capitalized_count = sum(1 for w in words if w and w[0].isupper())
-    if capitalized_count < 1: return False
-
-    title_lower = title.lower()
-    ui_phrases = ['see example', 'live example', 'read more', 'click here', 'follow on', 'view on', 'subscribe', 'newsletter', 'sign up', 'unsubscribe']
-    if any(p in title_lower for p in ui_phrases): return False
-
-    block_words = ['rsvp', 'workshop', 'webinar', 'sponsor', 'partner', 'ad ', 'advertisement', 'referral', 'free credits', 'get $', 'off deal', 'job board', 'hiring', 'careers', 'legal', 'tos', 'terms', 'archives', 'feedback', 'survey', 'community highlights', 'good morning', 'in today']
-    if any(word in title_lower for word in block_words): return False
-    
-    if article.get('source') != "Reddit" and len(summary) < 40: return False
+# --- NEW RSS-FIRST SCRAPERS ---
 
-    return True
+def parse_feed(content, source_name):
+    import feedparser
+    with tracing.span("feed_parse", source=source_name, bytes=len(content)) as sp:
+        feed = feedparser.parse(content)
+        sp["entries"] = len(feed.entries)
+    return feed
 
-# --- NEW RSS-FIRST SCRAPERS ---
+def editions_from_entries(feed, entries, source_name):
+    """Builds edition records for the given feed entries."""
+    articles = []
+    feed_image = (feed.feed.get('image') or {}).get('href')
+    units = []
+    for entry in entries:
+        html_content = entry.get('content', [{}])[0].get('value', entry.get('description', ''))
+        # Lead image: enclosures first, then the feed image; the parser falls back to the body
+        lead_image = next((enc.get('href') for enc in entry.get('enclosures', []) if enc.get('type', '').startswith('image/')), None)
+        units.append((html_content, lead_image or feed_image, source_name))
 
-def get_edition_resume(soup):
-    """Extracts a 2-3 sentence teaser/resume from the first substantial text blocks."""
-    paragraphs = []
-    # Look for the first few paragraphs that aren't too short or navigational
-    for p in soup.find_all(['p', 'div']):
-        text = p.get_text().strip()
-        # Skip short snippets, ads, or header junk
-        if len(text) > 60 and not any(x in text.lower() for x in ['subscribe', 'view in browser', 'read online']):
-            # Clean up extra whitespace/newlines
-            clean_text = re.sub(r'\s+', ' ', text)
-            paragraphs.append(clean_text)
-            if len(paragraphs) >= 2: break
-    
-    resume = " ".join(paragraphs)
-    if len(resume) > 350:
-        resume = resume[:347] + "..."
-    return resume
+    # HTML parsing is CPU-bound, so it runs on the executor (process pool or Modal workers)
+    with tracing.span("edition_parse", source=source_name, editions=len(units), bytes=sum(len(u[0]) for u in units)):
+        parsed = executors.current().map(parsing.parse_edition, units)
+
+    for entry, edition in zip(entries, parsed):
+        resume = edition["resume"] or (entry.summary[:300] if hasattr(entry, 'summary') else "")
+        try:
+            articles.append(Item(
+                type="edition",
+                title=entry.get('title'),
+                source=source_name,
+                url=entry.get('link'),
+                summary=resume,
+                published_at=entry.published if hasattr(entry, 'published') else datetime.now(timezone.utc).isoformat(),
+                thumbnail=edition["lead_image"],
+                # Keep up to 12; frontend shows 3 by default with Show More
+                stories=records.stories_from(edition["stories"])
+            ))
+        except records.SchemaError as e: print(f"   ⚠️ Skipping invalid {source_name} edition: {e}")
+    return articles
 
 def scrape_rss_edition(feed_url, source_name):
-    """Fetches and parses a newsletter edition from RSS."""
+    """Fetches and parses a newsletter edition from RSS. Returns None if the feed
+    couldn't be fetched ([] just means nothing fresh)."""
     print(f"🤖 Scraping RSS: {source_name}...")
-    import feedparser
+    response = net.fetch(feed_url, timeout=15)
+    if response is None or response.status_code != 200:
+        print(f"   ⚠️ Feed unavailable: {feed_url}")
+        return None
+    feed = parse_feed(response.content, source_name)
+    # Latest editions inside the freshness window, judged from feed dates before any parsing
+    entries = feeds.fresh_entries(feed.entries)[:EDITIONS_PER_FEED]
+    print(f"   🕒 {len(entries)} of {len(feed.entries)} entries are fresh")
+    return editions_from_entries(feed, entries, source_name)
+
+def posts_from_reddit(data):
     articles = []
-    feed = feedparser.parse(feed_url)
-    
-    # Take the latest 5 editions for broader coverage
-    for entry in feed.entries[:5]:
-        edition_id = str(uuid.uuid4())
-        html_content = entry.get('content', [{}])[0].get('value', entry.get('description', ''))
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # 1. Get Lead Image
-        lead_image = None
-        # Check enclosures
-        for enc in entry.get('enclosures', []):
-            if enc.get('type', '').startswith('image/'):
-                lead_image = enc.get('href')
-                break
-        
-        # Fallback 1: Feed image
-        if not lead_image and hasattr(feed.feed, 'image'):
-            lead_image = feed.feed.image.href
-
-        # Fallback 2: First large image in soup (avoid tiny icons)
-        if not lead_image:
-            for img in soup.find_all('img'):
-                src = img.get('src')
-                width = img.get('width', '500') # Assume large if no width
-                if src and src.startswith('http') and int(re.sub(r'\D', '', str(width)) or 500) > 100:
-                    lead_image = src
-                    break
-
-        # 2. Extract Edition Resume (Heuristic)
-        resume = get_edition_resume(soup) or (entry.summary[:300] if hasattr(entry, 'summary') else "")
-
-        # 3. Extract Nested Stories
-        sub_stories = []
-        # Newsletters often use h2 or strong links for main stories
-        potential_story_containers = soup.find_all(['h2', 'h3', 'strong'])
-        
-        for container in potential_story_containers:
-            link = container.find('a') if hasattr(container, 'find') else None
-            # If not in h2/h3, maybe it's just an <a> tag that's prominent
-            if not link and container.name == 'a': link = container
-            
-            if not link: continue
-            
-            href = link.get('href')
-            if not href or not href.startswith('http') or any(x in href.lower() for x in ['bensbites.com', 'therundown.ai', 'substack.com', 'beehiiv.com', 'twitter.com', 'x.com']):
-                continue
-            
-            title = link.get_text().strip()
-            if len(title) < 15: continue
-            
-            # Extract summary by looking at subsequent siblings
-            summary_parts = []
-            curr = container
-            # If it's a strong tag inside a p, move up to p
-            if curr.name == 'strong' and curr.parent and curr.parent.name == 'p':
-                curr = curr.parent
-            
-            limit = 0
-            sibling = curr.next_sibling
-            while sibling and limit < 3:
-                txt = sibling.get_text().strip() if hasattr(sibling, 'get_text') else str(sibling).strip()
-                if txt and len(txt) > 20:
-                    summary_parts.append(txt)
-                    if len(txt) > 80: break # Found a good paragraph
-                sibling = sibling.next_sibling
-                limit += 1
-
-            sub_stories.append({
-                "id": str(uuid.uuid4()),
-                "title": title,
-                "url": href,
-                "summary": " ".join(summary_parts)[:400],
-                "thumbnail": None # Will be enriched via OG tags later
-            })
-
-        # Filter stories to ensure high quality
-        valid_stories = [s for s in sub_stories if is_real_article({"title": s['title'], "summary": s['summary'], "source": source_name})]
-        
-        # Remove duplicates by URL
-        seen_urls = set()
-        unique_stories = []
-        for s in valid_stories:
-            if s['url'] not in seen_urls:
-                unique_stories.append(s)
-                seen_urls.add(s['url'])
-
-        articles.append({
-            "id": edition_id,
-            "type": "edition",
-            "title": entry.title,
-            "source": source_name,
-            "url": entry.link,
-            "resume": resume,
-            "summary": resume, # Compatibility fallback
-            "published_at": entry.published if hasattr(entry, 'published') else datetime.now(timezone.utc).isoformat(),
-            "thumbnail": lead_image,
-            "stories": unique_stories[:12] # Keep up to 12; frontend shows 3 by default with Show More
-        })
-    
+    for post in data.get("data", {}).get("children", []):
+        p = post["data"]
+        if not feeds.is_fresh(p.get("created_utc")): continue
+        try:
+            articles.append(Item(
+                type="article",  # Reddit posts are flat
+                title=p.get("title"),
+                source="Reddit",
+                url=f"https://www.reddit.com{p.get('permalink')}",
+                summary=p.get("selftext")[:400] if p.get("selftext") else None,
+                published_at=datetime.fromtimestamp(p.get("created_utc"), tz=timezone.utc).isoformat(),
+                thumbnail=p.get("thumbnail") if (p.get("thumbnail") or "").startswith("http") else None,
+                upvotes=p.get("score"),
+                comments=p.get("num_comments")
+            ))
+        except (records.SchemaError, TypeError) as e: print(f"   ⚠️ Skipping invalid Reddit post: {e}")
     return articles
 
 def fetch_reddit():
+    """Reddit posts inside the freshness window, or None if the fetch failed."""
     print("🤖 Fetching Reddit...")
-    articles = []
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get("https://www.reddit.com/r/ArtificialInteligence/new.json?limit=10", headers=headers, timeout=10)
-        if res.status_code == 200:
-            for post in res.json().get("data", {}).get("children", []):
-                p = post["data"]
-                articles.append({
-                    "id": str(uuid.uuid4()),
-                    "type": "article",
-                    "title": p.get("title"),
-                    "source": "Reddit",
-                    "url": f"https://www.reddit.com{p.get('permalink')}",
-                    "summary": p.get("selftext")[:400] if p.get("selftext") else None,
-                    "published_at": datetime.fromtimestamp(p.get("created_utc"), tz=timezone.utc).isoformat(),
-                    "thumbnail": p.get("thumbnail") if p.get("thumbnail", "").startswith("http") else None,
-                    "stories": [] # Reddit posts are flat
-                })
+        res = net.fetch(REDDIT_URL, timeout=10)
+        if res is not None and res.status_code == 200:
+            return posts_from_reddit(res.json())
     except Exception as e: print(f"   ⚠️ Reddit Error: {e}")
-    return articles
+    return None
 
 # --- MAIN RUNNER ---
 
-@app.function(image=image, volumes={"/data": vol}, timeout=1200)
-async def run_scrapers():
-    all_content = []
-    
-    # Newsletter RSS
-    feeds = [
-        ("https://www.bensbites.com/feed", "Ben's Bites"),
-        ("https://rss.beehiiv.com/feeds/2R3C6Bt5wj.xml", "The Rundown AI")
-    ]
-    
-    for url, name in feeds:
+@app.function(image=image, volumes={"/data": vol}, timeout=RUN_TIMEOUT, cpu=4.0, retries=RUN_RETRIES)
+async def run_scrapers(profile=None, executor=None):
+    """Runs the full pipeline. `profile` ("cprofile" | "pyinstrument") or the
+    GLAIDO_PROFILE env var enables a profiler for this run; `executor`
+    ("process" | "modal") or GLAIDO_EXECUTOR picks where parsing/enrichment run.
+    Progress is checkpointed on the volume, so a retry resumes the same run."""
+    executors.use(executors.from_name(executor, run_work_unit))
+    ckpt = checkpoints.start(f"{DATA_DIR}/runs", on_save=vol.commit, max_attempts=RUN_RETRIES + 1)
+    if ckpt.resumed: print(f"♻️  Resuming run {ckpt.run_id} ({', '.join(ckpt.manifest['stages'])} done)")
+    tracer = tracing.start_run(ckpt.run_id)
+    profile = profile or os.environ.get("GLAIDO_PROFILE")
+    with tracing.profiled(profile, f"{DATA_DIR}/runs/{tracer.run_id}"):
         try:
-            all_content.extend(scrape_rss_edition(url, name))
-        except Exception as e:
-            print(f"   ⚠️ Error scraping {name}: {e}")
+            payload = _run_pipeline(ckpt)
+        except Exception:
+            # Publish what the checkpoints hold; Modal's retry resumes from them
+            publish_partial(ckpt)
+            if ckpt.attempts > RUN_RETRIES: ckpt.finish("failed")  # no retry left to resume it
+            vol.commit()
+            raise
+        with tracing.span("volume_commit"):
+            vol.commit()
+    if has_pending(payload["articles"]): enrich_deferred.spawn()
+    tracer.save(f"{DATA_DIR}/timing_report.json")
+    tracer.save(f"{DATA_DIR}/runs/{tracer.run_id}_timing.json")
+    vol.commit()
+    slowest = sorted(tracer.summary().items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:5]
+    for name, stats in slowest:
+        print(f"   ⏱️  {name}: {stats['count']}x, total {stats['total_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms")
+    return payload
+
+def _run_pipeline(ckpt=None):
+    ckpt = ckpt or checkpoints.start(f"{DATA_DIR}/runs")
+    deadline = time.time() + RUN_BUDGET
+    # Once enrichment has started, its snapshot supersedes the per-source checkpoints
+    all_content = checkpointed_items(ckpt) if ckpt.has("enriched") else collect_sources(ckpt, deadline)
+
+    final_content = enrich_items(all_content, ckpt=ckpt, deadline=deadline)
+    cache_thumbnails(final_content, deadline)
+    payload = publish(final_content)
+    write_http_metrics(payload["last_updated"])
+    ckpt.finish()
+    print(f"✨ Success! Total editions/posts: {len(final_content)}")
+    return payload
+
+def source_stage(name):
+    return f"source-{checkpoints.slug(name)}"
 
-    # Reddit
-    all_content.extend(fetch_reddit())
+def collect_sources(ckpt, deadline):
+    """Scrapes every source this run hasn't checkpointed yet, saving each as it lands."""
+    all_content = []
+    sources = [(name, lambda url=url, name=name: scrape_rss_edition(url, name)) for url, name in FEEDS]
+    sources.append(("Reddit", fetch_reddit))
+    for name, scrape in sources:
+        if ckpt.has(source_stage(name)):
+            all_content.extend(ckpt.load_items(source_stage(name)))
+            continue
+        if time.time() > deadline:
+            print(f"   ⏭️  Out of time, skipping {name} (its previous items stay published)")
+            continue
+        with tracing.span("source", source=name) as sp:
+            try:
+                items = scrape()
+            except Exception as e:
+                sp["outcome"] = "error"
+                sp["error"] = str(e)[:200]
+                print(f"   ⚠️ Error scraping {name}: {e}")
+                continue
+            if items is None:  # failed fetch: leave it for the retry to try again
+                sp["outcome"] = "unavailable"
+                continue
+            sp["items"] = len(items)
+        all_content.extend(items)
+        ckpt.save(source_stage(name), items)  # [] too: nothing fresh is a result
+    return all_content
+
+def checkpointed_items(ckpt):
+    """Items a run already has: its enrichment snapshot if it got that far, else its finished sources."""
+    if ckpt.has("enriched"): return records.load_items(ckpt.load("enriched")["items"])
+    return [i for name in [n for _, n in FEEDS] + ["Reddit"] for i in ckpt.load_items(source_stage(name))]
+
+def publish_partial(ckpt):
+    """Publishes whatever a failed run has checkpointed. Records it didn't get
+    to enrich are marked pending."""
+    items = checkpointed_items(ckpt)
+    if not items: return None
+    enriched = set((ckpt.load("enriched") or {}).get("ids", []))
+    for r in (r for item in items for r in (item, *item.stories)):
+        if r.id not in enriched: r.pending = True
+    print(f"   📦 Publishing {len(items)} items from run {ckpt.run_id}'s checkpoints")
+    return publish(items)
 
-    # Enrichment (for nested stories and flat reddit posts)
+def publish(items, previous=None):
+    """Writes the payload, ranked (glaido/ranking.py). Sources this run has nothing new for
+    keep their previous items; items that fall out of the payload are spooled for the archive."""
+    if previous is None: previous = load_payload()["articles"]
+    merged = merge_items(previous, items, source_limits())
+    retention.spool(retention.evicted(previous, merged), f"{DATA_DIR}/archive")
+    with tracing.span("rank", items=len(merged)):
+        ranked, top = ranking.rank(merged)
+    return write_payload(ranked, top.to_wire())
+
+def enrichment_targets(items):
+    """(priority, deferred) records. Priority is what the dashboard shows first, in
+    display order: card headers, then each edition's first visible stories."""
+    priority = list(items)
+    for n in range(VISIBLE_STORIES):
+        priority.extend(item.stories[n] for item in items if len(item.stories) > n)
+    deferred = [s for item in items for s in item.stories[VISIBLE_STORIES:]]
+    return priority, deferred
+
+def enrich_records(targets, deadline=None, on_progress=None):
+    """OG-image enrichment for a list of records, chunked by host and run on the
+    current executor. Records not reached by `deadline` are marked pending.
+    `on_progress(records)` gets the newly finished records every `parallelism` chunks."""
+    executor = executors.current()
+    chunks = executors.chunk_by_host([{"record": r, "url": r.url} for r in targets], executor.parallelism * 2)
+    units = [([{"url": t["url"], "thumbnail": t["record"].thumbnail} for t in chunk], deadline) for chunk in chunks]
+    with tracing.span("enrich", targets=len(targets), chunks=len(chunks), executor=executor.name) as sp:
+        finished = []
+        for n, (chunk, (thumbs, done)) in enumerate(zip(chunks, executor.imap(enrich.enrich_chunk, units, io=True)), 1):
+            for target, thumb, ok in zip(chunk, thumbs, done):
+                target["record"].thumbnail = thumb
+                target["record"].pending = not ok
+                finished.append(target["record"])
+            if on_progress and (n % executor.parallelism == 0 or n == len(chunks)):
+                on_progress(finished)
+                finished = []
+        sp["pending"] = sum(1 for r in targets if r.pending)
+
+def enrich_items(items, budget=ENRICH_BUDGET, ckpt=None, deadline=None):
+    """Priority-ordered OG-image enrichment for editions, their stories and reddit posts.
+    Headers and visible stories get `budget` seconds; hidden stories (and anything
+    the budget didn't reach) are left pending for `enrich_deferred` / `enrich_edition` (serve_app.py).
+    With a checkpoint, progress is saved as chunks finish and finished records are skipped."""
     print("🖼️  Enriching with OG images...")
-    
-    def enrich_item(item):
-        # Enrich the edition itself if image is generic
-        enrich_article(item)
-        # Enrich individual stories
-        for story in item.get('stories', []):
-            enrich_article(story)
-        return item
+    priority, deferred = enrichment_targets(items)
+    done = set((ckpt.load("enriched") or {}).get("ids", [])) if ckpt else set()
+    for story in deferred: story.pending = True
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        final_content = list(executor.map(enrich_item, all_content))
+    def save_progress(finished):
+        done.update(r.id for r in finished if not r.pending)
+        ckpt.save("enriched", {"ids": sorted(done), "items": items})
 
+    until = time.time() + budget
+    if deadline: until = min(until, deadline)
+    enrich_records([r for r in priority if r.id not in done], until, save_progress if ckpt else None)
+    return items
+
+def has_pending(items):
+    return any(r.pending for item in items for r in (item, *item.stories))
+
+def cache_thumbnails(items, deadline=None):
+    """Validates card images and caches small WebP copies on the volume. Items not
+    started by `deadline` keep their original image URL (the dashboard falls back to it)."""
+    print("🗜️  Caching card thumbnails...")
+    thumbs_dir = f"{DATA_DIR}/thumbs"
+    os.makedirs(thumbs_dir, exist_ok=True)
+
+    def process(item):
+        if deadline and time.time() > deadline: return item
+        return thumbnails.process_item(item, thumbs_dir)
+
+    with tracing.span("thumbnails", items=len(items)) as sp:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(tracing.bind(process), items))
+        sp["cached"] = sum(1 for item in items if item.thumb)
+
+def load_payload():
+    """The published payload, with its articles loaded back into records."""
+    try:
+        with open(f"{DATA_DIR}/master_payload.json", "r") as f: payload = json.load(f)
+    except (OSError, ValueError): return {"last_updated": None, "articles": [], "top_stories": []}
+    payload["articles"] = records.load_items(payload.get("articles", []))
+    return payload
+
+def write_payload(articles, top_stories=None):
     payload = {
         "last_updated": datetime.now(timezone.utc).isoformat(),
-        "articles": final_content # Keeping key 'articles' for frontend compatibility but content is now hierarchical
+        "articles": articles, # Keeping key 'articles' for frontend compatibility but content is now hierarchical
+        "top_stories": top_stories or []
     }
     
-    with open("/data/master_payload.json", "w") as f:
-        json.dump(payload, f, indent=2)
-    
-    vol.commit()
-    print(f"✨ Success! Total editions/posts: {len(final_content)}")
+    with tracing.span("write_payload") as sp:
+        with open(f"{DATA_DIR}/master_payload.json", "w") as f:
+            json.dump(payload, f, indent=2, default=records.wire)
+        sp["bytes"] = os.path.getsize(f"{DATA_DIR}/master_payload.json")
     return payload
 
-@app.function(image=image, schedule=modal.Cron("0 0 * * *"), volumes={"/data": vol})
-def daily_scrape():
-    import asyncio
-    asyncio.run(run_scrapers.remote())
+def write_http_metrics(run_at):
+    """Per-host HTTP metrics (requests, retries, breaker trips, latency percentiles)."""
+    http_metrics = net.metrics()
+    with open(f"{DATA_DIR}/http_metrics.json", "w") as f:
+        json.dump({"run_at": run_at, "hosts": http_metrics}, f, indent=2)
+    tripped = [h for h, m in http_metrics.items() if m.get("circuit_open")]
+    if tripped: print(f"   ⛔ Skipped failing hosts: {', '.join(tripped)}")
 
-@app.function(image=image, volumes={"/data": vol})
-@modal.fastapi_endpoint(method="GET")
-def get_data():
-    try:
-        vol.reload()
-        with open("/data/master_payload.json", "r") as f: return json.load(f)
-    except: return {"error": "No data found."}
+@app.function(image=image, timeout=600)
+def run_work_unit(ref, args):
+    """Remote worker for the Modal executor backend (see glaido/executors.py)."""
+    return executors.run_unit(ref, args)
+
+@app.function(image=image, volumes={"/data": vol}, timeout=1800, cpu=4.0)
+def enrich_deferred():
+    """Background pass after a publish: enriches every pending record, then
+    applies the results (by id) to the latest payload and republishes."""
+    payload = load_payload()
+    cards = [i for i in payload["articles"] if i.pending]
+    targets = [r for item in payload["articles"] for r in (item, *item.stories) if r.pending]
+    if not targets: return 0
+    print(f"🖼️  Enriching {len(targets)} deferred items...")
+    enrich_records(targets)
+    cache_thumbnails(cards)
+    done = {r.id: r for r in targets if not r.pending}
+
+    # A poll may have published while we worked: merge into whatever is current
+    vol.reload()
+    latest = load_payload()
+    for item in latest["articles"]:
+        for r in (item, *item.stories):
+            src = done.get(r.id)
+            if not (r.pending and src): continue
+            r.thumbnail, r.pending = src.thumbnail, False
+            if r is item: r.thumb = src.thumb
+    write_payload(latest["articles"], latest.get("top_stories"))
+    vol.commit()
+    print(f"✨ Filled {len(done)}/{len(targets)} deferred thumbnails")
+    return len(done)
+
+# --- ADAPTIVE POLLING ---
+
+def poll_source(name, url, st, known_urls):
+    """Conditionally fetches one source. Returns (new items, publish timestamps, response)."""
+    response = net.fetch(url, timeout=15, headers=scheduler.conditional_headers(st))
+    if response is None or response.status_code != 200:
+        return [], [], response
+    if name == "Reddit":
+        data = response.json()
+        published = [p["data"].get("created_utc") for p in data.get("data", {}).get("children", []) if p["data"].get("created_utc")]
+        items = [p for p in posts_from_reddit(data) if p.url not in known_urls]
+        return items, published, response
+    feed = parse_feed(response.content, name)
+    entries = feeds.fresh_entries(feed.entries)[:EDITIONS_PER_FEED]
+    published = [t for t in map(feeds.entry_timestamp, feed.entries) if t]
+    # Only parse and enrich editions we haven't published yet
+    new_entries = [e for e in entries if e.get('link') not in known_urls]
+    return editions_from_entries(feed, new_entries, name), published, response
+
+def source_limits():
+    limits = {name: EDITIONS_PER_FEED for _, name in FEEDS}
+    limits["Reddit"] = 10  # matches ?limit=10 in REDDIT_URL
+    return limits
+
+def merge_items(articles, new_items, limit_by_source):
+    """New items first within their source, older ones kept up to the per-source limit."""
+    new_urls = {i.url for i in new_items}
+    merged = []
+    for source in [name for _, name in FEEDS] + ["Reddit"]:
+        fresh = [i for i in new_items if i.source == source]
+        old = [a for a in articles if a.source == source and a.url not in new_urls]
+        merged.extend((fresh + old)[:limit_by_source.get(source, EDITIONS_PER_FEED)])
+    return merged
+
+@app.function(image=image, schedule=modal.Cron("*/15 * * * *"), volumes={"/data": vol}, timeout=900, cpu=4.0)
+def poll_sources():
+    """Polls each source on its own learned cadence and only runs downstream
+    stages (parse, enrich, thumbnails, publish) for sources with new input."""
+    # enrich_deferred or run_scrapers may have published since this container mounted the volume
+    vol.reload()
+    state_path = f"{DATA_DIR}/scheduler_state.json"
+    state = scheduler.load_state(state_path)
+    now = datetime.now(timezone.utc).timestamp()
+    sources = [(url, name, scheduler.MIN_INTERVAL) for url, name in FEEDS] + [(REDDIT_URL, "Reddit", REDDIT_MIN_INTERVAL)]
+    due = [s for s in sources if scheduler.is_due(scheduler.source_state(state, s[1]), now)]
+    if not due:
+        print("💤 No sources due")
+        return None
+
+    tracer = tracing.start_run()
+    payload = load_payload()
+    new_items = []
+    for url, name, min_interval in due:
+        st = scheduler.source_state(state, name)
+        known_urls = {a.url for a in payload["articles"] if a.source == name}
+        with tracing.span("poll", source=name) as sp:
+            items, published, response = poll_source(name, url, st, known_urls)
+            sp["status"] = response.status_code if response is not None else None
+            sp["items"] = len(items)
+        scheduler.record_poll(st, response, len(items), published, now, min_interval)
+        new_items.extend(items)
+        print(f"   📡 {name}: {len(items)} new ({sp['status']})")
+
+    if new_items:
+        cache_thumbnails(enrich_items(new_items))
+        payload = publish(new_items, payload["articles"])
+        write_http_metrics(payload["last_updated"])
+        os.makedirs(f"{DATA_DIR}/runs", exist_ok=True)
+        tracer.save(f"{DATA_DIR}/runs/{tracer.run_id}_timing.json")
+
+    scheduler.save_state(state_path, state)
+    vol.commit()
+    if new_items and has_pending(new_items): enrich_deferred.spawn()
+    for line in scheduler.summary(state): print(f"   ⏲️  {line}")
+    return len(new_items)
+
+@app.function(image=image, schedule=modal.Cron("30 3 * * *"), volumes={"/data": vol}, timeout=600)
+def compact_history():
+    """Daily retention pass: rolls spooled items into gzipped per-day archives and
+    prunes old archives, run files and unreferenced thumbnails."""
+    vol.reload()
+    stats = retention.compact(DATA_DIR, load_payload()["articles"])
+    vol.commit()
+    days = ", ".join(f"{day} +{n}" for day, n in sorted(stats["archived"].items())) or "nothing new"
+    print(f"🗄️  Archived: {days}")
+    if stats["top"]: print(f"🏆 Archive's top story: {stats['top'][0]['title']}")
+    print(f"🧹 Pruned {stats['archives_pruned']} archives, {stats['runs_pruned']} run files, {stats['thumbs_pruned']} thumbnails")
+    return stats
 
 if __name__ == "__main__":
     modal.runner.deploy_app(app)
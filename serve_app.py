@@ -0,0 +1,99 @@
+"""Read-only serving endpoints for the dashboard.
+
+Kept apart from `modal_app.py` so the endpoints run on a lean image (no
+Playwright/Chromium, no scraping deps) and their containers only import this
+module. Keep module-level imports to the stdlib + modal; anything heavier
+belongs inside the function that needs it. `tools/coldstart_report.py`
+measures the import cost of both modules.
+"""
+import os
+import re
+
+import modal
+
+app = modal.App("glaido-serve")  # Included into "glaido-scraper" by modal_app.py, so endpoint URLs are unchanged
+vol = modal.Volume.from_name("glaido-data", create_if_missing=True)
+DATA_DIR = os.environ.get("GLAIDO_DATA_DIR", "/data")
+
+serve_image = modal.Image.debian_slim(python_version="3.10").pip_install("fastapi[standard]")
+# `enrich_edition` fetches OG images, so it also needs glaido's fetching deps (still no browser)
+enrich_image = serve_image.pip_install("requests", "beautifulsoup4").add_local_python_source("glaido")
+
+# Must match thumb_key() in glaido/thumbnails.py (not imported here: it pulls in requests/bs4)
+THUMB_KEY_RE = re.compile(r"^[0-9a-f]{20}$")
+
+ENDPOINT_OPTS = dict(
+    image=serve_image,
+    volumes={"/data": vol},
+    scaledown_window=600,         # stay warm between dashboard visits
+    enable_memory_snapshot=True,  # restore imports from a snapshot on cold start
+)
+
+
+def read_payload(data_dir=DATA_DIR):
+    """Raw bytes of the published payload, or None. Served as-is: parsing and
+    re-serializing a multi-MB JSON on every request is pure overhead."""
+    try:
+        with open(os.path.join(data_dir, "master_payload.json"), "rb") as f: return f.read()
+    except OSError: return None
+
+
+def data_response(data_dir=DATA_DIR):
+    """Body of `get_data` minus the volume reload, so it can be load-tested
+    outside Modal (benchmarks/load_test.py)."""
+    from fastapi import Response
+    body = read_payload(data_dir)
+    if body is None: return {"error": "No data found."}
+    return Response(content=body, media_type="application/json")
+
+
+def read_thumbnail(key, data_dir=DATA_DIR):
+    if not key or not THUMB_KEY_RE.match(key): return None
+    try:
+        with open(os.path.join(data_dir, "thumbs", f"{key}.webp"), "rb") as f: return f.read()
+    except OSError: return None
+
+
+@app.function(**ENDPOINT_OPTS)
+@modal.fastapi_endpoint(method="GET")
+def get_data():
+    try: vol.reload()
+    except Exception: pass  # serve the last committed payload rather than an error
+    return data_response()
+
+
+@app.function(**ENDPOINT_OPTS)
+@modal.fastapi_endpoint(method="GET")
+def get_thumbnail(k: str):
+    """Serves a cached card thumbnail by key (see glaido/thumbnails.py)."""
+    from fastapi import Response
+    data = read_thumbnail(k)
+    if data is None and THUMB_KEY_RE.match(k or ""):
+        vol.reload()
+        data = read_thumbnail(k)
+    if data is None: return Response(status_code=404)
+    # Keys are URL hashes, so a given key never changes content
+    return Response(content=data, media_type="image/webp", headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+@app.function(**dict(ENDPOINT_OPTS, image=enrich_image), timeout=120)
+@modal.fastapi_endpoint(method="GET")
+def enrich_edition(id: str):
+    """On-demand completion when a user expands an edition: enriches its pending
+    stories now and returns {story_id: thumbnail}. Persisting is left to
+    `enrich_deferred` (modal_app.py), the only writer besides the pipeline."""
+    import json
+    import time
+    from glaido import enrich, parsing
+    parsing.WORKERS = 0  # a dozen <head> parses don't justify starting a pool
+    try: vol.reload()
+    except Exception: pass
+    body = read_payload()
+    articles = json.loads(body).get("articles", []) if body else []
+    edition = next((a for a in articles if a.get("id") == id), None)
+    if edition is None: return {"stories": {}}
+    stories = edition.get("stories") or []
+    pending = [s for s in stories if s.get("pending")]
+    thumbs, _ = enrich.enrich_chunk(pending, time.time() + 20)
+    for story, thumb in zip(pending, thumbs): story["thumbnail"] = thumb
+    return {"stories": {s.get("id"): s.get("thumbnail") for s in stories}}
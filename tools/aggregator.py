@@ -1,19 +1,22 @@
 import asyncio
 import json
 import os
+import sys
 import concurrent.futures
 from datetime import datetime, timezone
 
-import requests
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from glaido import net, ranking, records, tracing
+
 def get_og_image(url):
     """Extract og:image or twitter:image from a URL."""
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=6, allow_redirects=True)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
+        response = net.fetch(url, timeout=6)
+        if response is not None and response.status_code == 200:
+            with tracing.span("og_parse", bytes=len(response.content)):
+                soup = BeautifulSoup(response.text, 'html.parser')
             for attr, name in [("property", "og:image"), ("name", "twitter:image"), ("property", "og:image:url")]:
                 tag = soup.find("meta", {attr: name})
                 if tag and tag.get("content"):
@@ -32,16 +35,18 @@ def enrich_article(article):
 
 async def run_scraper(script_name):
     print(f"Executing {script_name}...")
-    try:
-        process = await asyncio.create_subprocess_exec(
-            'python3', script_name,
-            cwd='/Users/stefanorossi/Documents/Scraperrrr 2'
-        )
-        await process.wait()
-        return True
-    except Exception as e:
-        print(f"Error running {script_name}: {e}")
-        return False
+    with tracing.span("scraper", script=script_name) as sp:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'python3', script_name,
+                cwd='/Users/stefanorossi/Documents/Scraperrrr 2'
+            )
+            sp["returncode"] = await process.wait()
+            return True
+        except Exception as e:
+            sp["outcome"] = "error"
+            print(f"Error running {script_name}: {e}")
+            return False
 
 def is_real_article(article):
     """Filter out ads, sponsors, RSVPs, and meta-content."""
@@ -75,6 +80,13 @@ def is_real_article(article):
 
 async def main():
     print("🚀 Starting Aggregator...")
+    tracer = tracing.start_run()
+    with tracing.profiled(os.environ.get("GLAIDO_PROFILE"), f".tmp/profile_{tracer.run_id}"):
+        await aggregate()
+    tracer.save(".tmp/timing_report.json")
+    print(f"⏱️  Timing report saved to .tmp/timing_report.json ({tracer.report()['total_ms']:.0f}ms)")
+
+async def aggregate():
     
     scrapers = [
         'tools/bensbites_scraper.py',
@@ -110,8 +122,9 @@ async def main():
             print(f"   → {len(articles_needing_images)}/{len(articles)} articles need images")
             
             if articles_needing_images:
-                with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                    enriched = list(executor.map(enrich_article, articles_needing_images))
+                with tracing.span("enrich", source=source, items=len(articles_needing_images)):
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+                        enriched = list(executor.map(tracing.bind(enrich_article), articles_needing_images))
                 # Merge back
                 enriched_ids = {a['id']: a for a in enriched}
                 articles = [enriched_ids.get(a['id'], a) for a in articles]
@@ -122,23 +135,27 @@ async def main():
         else:
             print(f"⚠️ Missing data from {source} ({path})")
             
-    # Sort by published_at (newest first)
-    master_articles.sort(key=lambda x: x['published_at'], reverse=True)
+    # Rank by relevance (recency, duplicates, engagement, keywords) instead of date alone
+    master_articles, top = ranking.rank(records.load_items(master_articles))
     
     payload = {
         "last_updated": datetime.now(timezone.utc).isoformat(),
         "articles": master_articles,
+        "top_stories": top.to_wire(),
         "saved_ids": []
     }
     
     with open(".tmp/master_payload.json", "w") as f:
-        json.dump(payload, f, indent=2)
+        json.dump(payload, f, indent=2, default=records.wire)
     
     dashboard_path = "dashboard/public/data.json"
     if os.path.exists("dashboard/public"):
         with open(dashboard_path, "w") as f:
-            json.dump(payload, f, indent=2)
+            json.dump(payload, f, indent=2, default=records.wire)
         print(f"📡 Synced data to {dashboard_path}")
+
+    with open(".tmp/http_metrics.json", "w") as f:
+        json.dump(net.metrics(), f, indent=2)
         
     print(f"\n✨ Aggregation Complete. Total Articles: {len(master_articles)}")
 
@@ -1,16 +1,31 @@
 import asyncio
 import json
-import uuid
-from datetime import datetime, timedelta, timezone
+import os
+import sys
+from datetime import datetime, timezone
 from playwright.async_api import async_playwright
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from glaido import backfill, feeds, records
+
 class BensBitesScraper:
-    def __init__(self):
+    def __init__(self, force_render=False):
         self.base_url = "https://www.bensbites.com/"
+        self.feed_url = feeds.BENSBITES_FEED
+        self.marker_path = ".tmp/bensbites_last_post.txt"
+        self.force_render = force_render
         self.articles = []
 
+    def discover_latest_post(self):
+        """Finds the most recent edition from RSS (no browser needed)."""
+        posts = feeds.discover_posts(self.feed_url, limit=1)
+        if posts:
+            print(f"Latest post found via RSS: {posts[0]['url']}")
+            return posts[0]
+        return None
+
     async def get_latest_post_url(self, page):
-        """Finds the URL of the most recent newsletter edition."""
+        """Fallback: finds the URL of the most recent edition by rendering the homepage."""
         print("Navigating to Ben's Bites homepage...")
         await page.goto(self.base_url, wait_until="domcontentloaded")
         await asyncio.sleep(2)
@@ -26,8 +41,8 @@ class BensBitesScraper:
             return url
         return None
 
-    async def scrape_post(self, page, post_url):
-        """Scrapes articles from a specific post URL."""
+    async def scrape_post(self, page, post_url, published_at=None):
+        """Scrapes articles from a specific post URL and returns them."""
         print(f"Scraping post: {post_url}...")
         await page.goto(post_url, wait_until="domcontentloaded")
         await asyncio.sleep(3)
@@ -37,7 +52,7 @@ class BensBitesScraper:
             datetime_str = await time_tag.get_attribute("datetime")
             pub_date = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
         else:
-            pub_date = datetime.now(timezone.utc)
+            pub_date = published_at or datetime.now(timezone.utc)
 
         # Extraction logic in a single evaluate call
         articles_data = await page.evaluate('''(pubDate) => {
@@ -67,47 +82,85 @@ class BensBitesScraper:
             return results;
         }''')
 
+        articles = []
         for item in articles_data:
-            article = {
-                "id": str(uuid.uuid4()),
-                "title": item['title'][:100],
-                "source": "Ben's Bites",
-                "url": item['url'],
-                "summary": item['summary'][:300],
-                "published_at": pub_date.isoformat(),
-                "thumbnail": item['thumbnail'],
-                "tags": ["AI"],
-                "is_saved": False
-            }
-            self.articles.append(article)
+            try:
+                articles.append(records.Item(
+                    type="article",
+                    title=item['title'][:100],
+                    source="Ben's Bites",
+                    url=item['url'],
+                    summary=item['summary'][:300],
+                    published_at=pub_date.isoformat(),
+                    thumbnail=item['thumbnail']
+                ))
+            except records.SchemaError as e: print(f"   ⚠️ Skipping invalid item: {e}")
+        self.articles.extend(articles)
+        return articles
 
-    async def run(self):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-            )
+    async def new_context(self, p):
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+        )
 
-            # Load Ben's Bites cookies if available
-            try:
-                with open("/Users/stefanorossi/Documents/Scraperrrr 2/.tmp/cookies_bensbites.json", "r") as f:
-                    cookies = json.load(f)
-                    await context.add_cookies(cookies)
-                print("✅ Ben's Bites session cookies loaded.")
-            except Exception as e:
-                print(f"⚠️ Could not load cookies: {e}")
+        # Load Ben's Bites cookies if available
+        try:
+            with open("/Users/stefanorossi/Documents/Scraperrrr 2/.tmp/cookies_bensbites.json", "r") as f:
+                cookies = json.load(f)
+                await context.add_cookies(cookies)
+            print("✅ Ben's Bites session cookies loaded.")
+        except Exception as e:
+            print(f"⚠️ Could not load cookies: {e}")
+        return browser, context
 
+    async def run_backfill(self, posts, out_path, concurrency=backfill.CONCURRENCY):
+        """Scrapes several editions on concurrent pages, writing each to out_path as it finishes."""
+        print(f"Backfilling {len(posts)} Ben's Bites editions ({concurrency} pages)...")
+        if not self.force_render: backfill.extract_from_feed(posts, "Ben's Bites", out_path)
+        if backfill.pending(posts, out_path):
+            async with async_playwright() as p:
+                browser, context = await self.new_context(p)
+                try:
+                    await backfill.scrape_all(context, posts, lambda page, post: self.scrape_post(page, post["url"], post["published_at"]), out_path, concurrency)
+                finally:
+                    await browser.close()
+        self.articles = backfill.read_articles(out_path)
+        print(f"✅ Backfilled {len(self.articles)} articles from Ben's Bites into {out_path}.")
+        return self.articles
+
+    async def run(self):
+        post = self.discover_latest_post()
+        if post and not self.force_render:
+            if post["url"] == feeds.read_marker(self.marker_path):
+                print("⏭️  No new Ben's Bites edition since last run, skipping.")
+                return self.articles
+            # Most editions ship their full HTML in the feed, so no browser is needed
+            self.articles = feeds.articles_from_post(post, "Ben's Bites")
+            if self.articles:
+                feeds.write_marker(self.marker_path, post["url"])
+                print(f"✅ Extracted {len(self.articles)} articles from the feed (no browser).")
+                return self.articles
+
+        async with async_playwright() as p:
+            browser, context = await self.new_context(p)
             page = await context.new_page()
             
             try:
-                url = await self.get_latest_post_url(page)
+                url = post["url"] if post else await self.get_latest_post_url(page)
                 if url:
                     await self.scrape_post(page, url)
+                    feeds.write_marker(self.marker_path, url)
             finally:
                 await browser.close()
                 print(f"✅ Scraped {len(self.articles)} articles from Ben's Bites.")
                 return self.articles
 
 if __name__ == "__main__":
-    scraper = BensBitesScraper()
-    asyncio.run(scraper.run())
+    args = backfill.parse_args("Scrape the latest Ben's Bites edition, or backfill several.")
+    scraper = BensBitesScraper(force_render=args.force_render)
+    if args.backfill:
+        posts = backfill.select_posts(scraper.feed_url, args.since, args.until, args.urls)
+        asyncio.run(scraper.run_backfill(posts, args.out or backfill.default_out("bensbites"), args.concurrency))
+    else:
+        asyncio.run(scraper.run())
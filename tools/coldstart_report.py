@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_profile(module, runs=3):
+    """Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+    returns total wall time plus the heaviest top-level imports (cumulative)."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+        if best is None or wall_ms < best[0]:
+            best = (wall_ms, proc.stderr)
+
+    wall_ms, stderr = best
+    total_us, direct = 0, []
+    for line in stderr.splitlines():
+        # "import time:  self [us] | cumulative | <2 spaces per nesting level>package"
+        if not line.startswith("import time:") or "imported package" in line: continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        # Children are printed before their parent, so the level-1 lines since the
+        # last level-0 line belong to that parent (startup imports like `site` come first)
+        if level == 0 and name.strip() == module:
+            total_us = int(cumulative_us)
+            break
+        if level == 0: direct = []
+        elif level == 1: direct.append((name.strip(), int(cumulative_us)))
+    return {
+        "module": module,
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(total_us / 1000, 1),
+        "heaviest": [{"name": n, "ms": round(us / 1000, 1)} for n, us in sorted(direct, key=lambda x: -x[1])[:10]],
+    }
+
+def first_byte(url):
+    """Time to first byte for a GET (run after the endpoint has been idle to measure a cold start)."""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=120) as res:
+        res.read(1)
+        ttfb = (time.perf_counter() - start) * 1000
+        res.read()
+    return {"url": url, "ttfb_ms": round(ttfb, 1), "total_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time / cold-start report for the serving and scraping modules.")
+    parser.add_argument("--url", action="append", default=[], help="endpoint to time (repeatable)")
+    parser.add_argument("--out", default=".tmp/coldstart_report.json")
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "imports": [import_profile(m) for m in ("serve_app", "modal_app")]}
+    report["endpoints"] = [first_byte(u) for u in args.url]
+
+    for r in report["imports"]:
+        if "error" in r:
+            print(f"⚠️  {r['module']}: {r['error']}")
+            continue
+        print(f"📦 {r['module']}: import {r['import_ms']}ms (interpreter + import {r['wall_ms']}ms)")
+        for h in r["heaviest"][:5]:
+            print(f"     {h['ms']:>8}ms  {h['name']}")
+    for e in report["endpoints"]:
+        print(f"🌐 {e['url']}: first byte {e['ttfb_ms']}ms, total {e['total_ms']}ms")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Saved {args.out}")
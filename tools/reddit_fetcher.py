@@ -1,8 +1,11 @@
-import requests
 import json
-import uuid
+import os
+import sys
 from datetime import datetime, timezone
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from glaido import feeds, net, records
+
 def test_reddit_json():
     # Reddit's .json endpoint often works with a proper user-agent
     url = "https://www.reddit.com/r/ArtificialInteligence/new.json?limit=10"
@@ -12,7 +15,10 @@ def test_reddit_json():
     
     print(f"Testing Reddit JSON endpoint: {url}")
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = net.fetch(url, headers=headers, timeout=10)
+        if response is None:
+            print("Reddit unreachable (retries exhausted or circuit open)")
+            return None
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -22,10 +28,10 @@ def test_reddit_json():
             
             for post in posts:
                 p_data = post.get("data", {})
-                # Filter for last 24 hours (86400 seconds)
+                # Filter for last 24 hours (feeds.FRESHNESS_WINDOW)
                 created_utc = p_data.get("created_utc")
-                # if datetime.now(timezone.utc).timestamp() - created_utc > 86400:
-                #     continue
+                if not feeds.is_fresh(created_utc):
+                    continue
                 
                 # Improvement: Get higher quality preview image if available
                 thumbnail = p_data.get("thumbnail")
@@ -37,26 +43,27 @@ def test_reddit_json():
                 if thumbnail:
                     thumbnail = thumbnail.replace("&amp;", "&")
 
-                article = {
-                    "id": str(uuid.uuid4()),
-                    "title": p_data.get("title"),
-                    "source": "Reddit",
-                    "url": f"https://www.reddit.com{p_data.get('permalink')}",
-                    "summary": p_data.get("selftext")[:200] if p_data.get("selftext") else None,
-                    "published_at": datetime.fromtimestamp(created_utc, tz=timezone.utc).isoformat(),
-                    "thumbnail": thumbnail if thumbnail and thumbnail.startswith("http") else None,
-                    "tags": ["Reddit", p_data.get("subreddit")],
-                    "is_saved": False
-                }
-                articles.append(article)
+                try:
+                    articles.append(records.Item(
+                        type="article",
+                        title=p_data.get("title"),
+                        source="Reddit",
+                        url=f"https://www.reddit.com{p_data.get('permalink')}",
+                        summary=p_data.get("selftext")[:200] if p_data.get("selftext") else None,
+                        published_at=datetime.fromtimestamp(created_utc, tz=timezone.utc).isoformat(),
+                        thumbnail=thumbnail if thumbnail and thumbnail.startswith("http") else None,
+                        upvotes=p_data.get("score"),
+                        comments=p_data.get("num_comments")
+                    ))
+                except (records.SchemaError, TypeError) as e: print(f"Skipping invalid post: {e}")
             
             if articles:
-                print(f"DEBUG: First article thumbnail: {articles[0].get('thumbnail')}")
+                print(f"DEBUG: First article thumbnail: {articles[0].thumbnail}")
             print(f"Successfully fetched {len(articles)} recent articles from Reddit.")
             
             # Save to .tmp for aggregator
             with open(".tmp/reddit_latest.json", "w") as f:
-                json.dump(articles, f, indent=2)
+                json.dump(articles, f, indent=2, default=records.wire)
                 
             return articles
         else:
@@ -1,15 +1,35 @@
 import asyncio
 import json
-import uuid
-from datetime import datetime, timedelta, timezone
+import os
+import sys
+from datetime import datetime, timezone
 from playwright.async_api import async_playwright
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from glaido import backfill, feeds, records
+
 class RundownScraper:
-    def __init__(self):
+    def __init__(self, force_render=False):
         self.base_url = "https://www.therundown.ai"
+        self.feed_url = feeds.RUNDOWN_FEED
+        self.marker_path = ".tmp/rundown_last_post.txt"
+        self.force_render = force_render
         self.articles = []
 
+    def discover_latest_post(self):
+        """Finds the most recent edition from RSS (no browser needed)."""
+        posts = feeds.discover_posts(self.feed_url, limit=1)
+        if posts:
+            print(f"Latest Rundown post found via RSS: {posts[0]['url']}")
+            return posts[0]
+        return None
+
+    def save(self):
+        with open(".tmp/rundown_latest.json", "w") as f:
+            json.dump(self.articles, f, indent=2, default=records.wire)
+
     async def get_latest_post_url(self, page):
+        """Fallback: finds the newest post by rendering the homepage."""
         print(f"Navigating to {self.base_url}...")
         await page.goto(self.base_url, wait_until="domcontentloaded")
         await asyncio.sleep(3)
@@ -25,7 +45,7 @@ class RundownScraper:
             return url
         return None
 
-    async def scrape_post(self, page, post_url):
+    async def scrape_post(self, page, post_url, published_at=None):
         print(f"Scraping post: {post_url}...")
         await page.goto(post_url, wait_until="domcontentloaded")
         await asyncio.sleep(4)
@@ -107,49 +127,89 @@ class RundownScraper:
             return results;
         }''', post_url)
 
+        published_at = (published_at or datetime.now(timezone.utc)).isoformat()
+        articles = []
         for item in articles_data:
-            article = {
-                "id": str(uuid.uuid4()),
-                "title": item['title'],
-                "source": "The Rundown AI",
-                "url": item['url'],
-                "summary": item['summary'][:400],
-                "published_at": datetime.now(timezone.utc).isoformat(),
-                "thumbnail": item['thumbnail'],
-                "tags": ["AI"],
-                "is_saved": False
-            }
-            self.articles.append(article)
+            try:
+                articles.append(records.Item(
+                    type="article",
+                    title=item['title'],
+                    source="The Rundown AI",
+                    url=item['url'],
+                    summary=item['summary'][:400],
+                    published_at=published_at,
+                    thumbnail=item['thumbnail']
+                ))
+            except records.SchemaError as e: print(f"   ⚠️ Skipping invalid item: {e}")
+        self.articles.extend(articles)
+        return articles
+
+    async def new_context(self, p):
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+        )
+
+        # Load Rundown cookies if available
+        try:
+            with open("/Users/stefanorossi/Documents/Scraperrrr 2/.tmp/cookies_rundown.json", "r") as f:
+                cookies = json.load(f)
+                await context.add_cookies(cookies)
+            print("✅ Rundown session cookies loaded.")
+        except Exception as e:
+            print(f"⚠️ Could not load cookies: {e}")
+        return browser, context
+
+    async def run_backfill(self, posts, out_path, concurrency=backfill.CONCURRENCY):
+        """Scrapes several editions on concurrent pages, writing each to out_path as it finishes."""
+        print(f"Backfilling {len(posts)} Rundown editions ({concurrency} pages)...")
+        if not self.force_render: backfill.extract_from_feed(posts, "The Rundown AI", out_path)
+        if backfill.pending(posts, out_path):
+            async with async_playwright() as p:
+                browser, context = await self.new_context(p)
+                try:
+                    await backfill.scrape_all(context, posts, lambda page, post: self.scrape_post(page, post["url"], post["published_at"]), out_path, concurrency)
+                finally:
+                    await browser.close()
+        self.articles = backfill.read_articles(out_path)
+        print(f"✅ Backfilled {len(self.articles)} articles from The Rundown AI into {out_path}.")
+        return self.articles
 
     async def run(self):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-            )
-            
-            # Load Rundown cookies if available
-            try:
-                with open("/Users/stefanorossi/Documents/Scraperrrr 2/.tmp/cookies_rundown.json", "r") as f:
-                    cookies = json.load(f)
-                    await context.add_cookies(cookies)
-                print("✅ Rundown session cookies loaded.")
-            except Exception as e:
-                print(f"⚠️ Could not load cookies: {e}")
+        post = self.discover_latest_post()
+        if post and not self.force_render:
+            if post["url"] == feeds.read_marker(self.marker_path):
+                # Keep the previous .tmp/rundown_latest.json for the aggregator
+                print("⏭️  No new Rundown edition since last run, skipping.")
+                return
+            # Most editions ship their full HTML in the feed, so no browser is needed
+            self.articles = feeds.articles_from_post(post, "The Rundown AI")
+            if self.articles:
+                self.save()
+                feeds.write_marker(self.marker_path, post["url"])
+                print(f"✅ Extracted {len(self.articles)} articles from the feed (no browser).")
+                return
 
+        async with async_playwright() as p:
+            browser, context = await self.new_context(p)
             page = await context.new_page()
             try:
-                latest_url = await self.get_latest_post_url(page)
+                latest_url = post["url"] if post else await self.get_latest_post_url(page)
                 if latest_url:
                     await self.scrape_post(page, latest_url)
-                print(json.dumps(self.articles, indent=2))
-                with open(".tmp/rundown_latest.json", "w") as f:
-                    json.dump(self.articles, f, indent=2)
+                print(json.dumps(self.articles, indent=2, default=records.wire))
+                self.save()
+                if latest_url: feeds.write_marker(self.marker_path, latest_url)
             except Exception as e:
                 print(f"Scraper error: {e}")
             finally:
                 await browser.close()
 
 if __name__ == "__main__":
-    scraper = RundownScraper()
-    asyncio.run(scraper.run())
+    args = backfill.parse_args("Scrape the latest Rundown edition, or backfill several.")
+    scraper = RundownScraper(force_render=args.force_render)
+    if args.backfill:
+        posts = backfill.select_posts(scraper.feed_url, args.since, args.until, args.urls)
+        asyncio.run(scraper.run_backfill(posts, args.out or backfill.default_out("rundown"), args.concurrency))
+    else:
+        asyncio.run(scraper.run())